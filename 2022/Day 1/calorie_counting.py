@@ -37,34 +37,277 @@ Date of Creation: 12/1/2022
 """
 import os
 import argparse
-from typing import Tuple
+import glob
+import heapq
+import itertools
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+_CHUNK_SIZE = 1 << 22  # Bytes handed to the bulk parser at a time (before boundary alignment)
+_SHARD_SIZE = 1 << 26  # Bytes of a single file handed to a worker process at a time
 
-def _get_calories_for_each_elf(file: str) -> list:
+# A line break followed by one or more blank lines, which is what separates two elves
+_GROUP_SEPARATOR = re.compile(rb"\r?\n(?:[ \t]*\r?\n)+")
+
+
+def _iter_calories_by_line(file: str) -> Iterator[int]:
 	"""
-	Opens a provided file and parses it to get the calorie count for each elf
+	Opens a provided file and lazily yields the calorie count for each elf as soon as the
+	blank line closing out its group is read
 
 	:param str file: File to be opened
-	:return list: List with the total calories each elf is holding
+	:return Iterator[int]: Iterator over the total calories each elf is holding
 	"""
-	calorie_list = list()
+	calories = None
 
 	with open(file, "r") as fptr:
 		for line in fptr:
-			if len(calorie_list) == 0 or (line == "\n" and calorie_list[-1] != 0):
-				calorie_list.append(0)
-			else:
-				calorie_list[-1] += int(line.strip("\n\r"))
+			line = line.strip("\n\r")
+
+			if line:
+				calories = int(line) if calories is None else calories + int(line)
+			elif calories is not None:
+				yield calories
+				calories = None
+
+	if calories is not None:
+		yield calories
+
+
+def _iter_calories_by_chunk(file: str, start: int = 0, end: int = None) -> Iterator[int]:
+	"""
+	Memory maps a provided file and lazily yields the calorie count for each elf. The file is
+	consumed in large chunks which always end on a group boundary, so each group can be summed
+	with a single split rather than handling the file one line at a time.
+
+	Both '\n' and '\r\n' line endings are supported, as are leading / trailing blank lines.
+
+	A byte range can be provided to only parse part of the file. Groups are assigned to a range
+	using the first separator found at or after each end of the range, so splitting a file into
+	back to back ranges yields every group exactly once, even if the split lands inside a group.
+
+	:param str file: File to be opened
+	:param int start: Byte offset where the range to parse starts, defaults to 0
+	:param int end: Byte offset where the range to parse ends, defaults to the end of the file
+	:return Iterator[int]: Iterator over the total calories each elf is holding
+	"""
+	size = os.path.getsize(file)
+	end = size if end is None else min(end, size)
+
+	if start >= end:
+		return
+
+	with open(file, "rb") as fptr, \
+		mmap.mmap(fptr.fileno(), 0, access=mmap.ACCESS_READ) as data:
+
+		def find_separator(offset: int, limit: int) -> Tuple[int, int]:
+			"""
+			Helper function which finds the first group separator at or after a given offset.
+
+			:param int offset: Offset to start searching from
+			:param int limit: Offset past which a separator will not be searched for
+			:return Tuple[int, int]: Start and end of the separator, both limit if none is found
+			"""
+			match = _GROUP_SEPARATOR.search(data, offset, limit)
+			return (match.start(), match.end()) if match else (limit, limit)
+
+		pos = 0 if start == 0 else find_separator(start, size)[1]
+		stop = size if end == size else find_separator(end, size)[0]
+
+		while pos < stop:
+			cut, next_pos = find_separator(pos + _CHUNK_SIZE, stop)
+
+			for group in _GROUP_SEPARATOR.split(data[pos:cut]):
+				items = group.split()
+				if items:
+					yield sum(map(int, items))
+
+			pos = next_pos
+
+
+def _iter_calories_for_each_elf(file: str, engine: str = "lines") -> Iterator[int]:
+	"""
+	Lazily yields the calorie count for each elf using the requested parsing engine
+
+	:param str file: File to be opened
+	:param str engine: Name of the parsing engine to use (see _ENGINES), defaults to "lines"
+	:return Iterator[int]: Iterator over the total calories each elf is holding
+	"""
+	return _ENGINES[engine](file)
+
+
+def _get_calories_for_each_elf(file: str, engine: str = "lines") -> list:
+	"""
+	Opens a provided file and parses it to get the calorie count for each elf
+
+	:param str file: File to be opened
+	:param str engine: Name of the parsing engine to use (see _ENGINES), defaults to "lines"
+	:return list: List with the total calories each elf is holding
+	"""
+	return list(_iter_calories_for_each_elf(file, engine))
+
+
+def _get_top_k_heap(calories: Iterable[int], top_k: int = 3) -> List[int]:
+	"""
+	Streams through the calorie count of each elf while only holding on to the top_k largest
+	values in a min-heap, so memory stays constant regardless of the number of elves.
+
+	:param Iterable[int] calories: Calorie count for each elf
+	:param int top_k: Number of elves to keep track of, defaults to 3
+	:return List[int]: Min-heap with (at most) the top_k largest calorie counts
+	"""
+	heap = list()
+
+	for total in calories:
+		if len(heap) < top_k:
+			heapq.heappush(heap, total)
+		elif total > heap[0]:
+			heapq.heapreplace(heap, total)
+
+	return heap
+
+
+def _get_top_calories(calories: Iterable[int], top_k: int = 3) -> Tuple[int, int]:
+	"""
+	Finds the elves carrying the most calories without storing every elf's total. Returns
+	a tuple containing two values: (A, B)
+
+	A = Total number of calories carried by the elf with the most calories
+	B = Sum of the top_k elves holding the most calories
+
+	:param Iterable[int] calories: Calorie count for each elf
+	:param int top_k: Number of elves to keep track of, defaults to 3
+	:return Tuple[int, int]: (A, B)
+	"""
+	heap = _get_top_k_heap(calories, top_k)
 
-	return calorie_list
+	return max(heap, default=0), sum(heap)
+
+
+def _get_shards(
+	files: List[str], engine: str, shard_size: int = _SHARD_SIZE
+) -> List[Tuple[str, int, Optional[int]]]:
+	"""
+	Splits the provided files into (file, start, end) byte ranges which can be parsed
+	independently. Only the 'mmap' engine supports byte ranges, every other engine gets one
+	shard per file.
+
+	:param List[str] files: Files to be split up
+	:param str engine: Name of the parsing engine that will be used
+	:param int shard_size: Target size of each byte range, defaults to _SHARD_SIZE
+	:return List[Tuple[str, int, Optional[int]]]: List of (file, start, end) shards
+	"""
+	shards = list()
+
+	for file in files:
+		if engine != "mmap":
+			shards.append((file, 0, None))
+			continue
+
+		size = os.path.getsize(file)
+		shards.extend(
+			(file, start, min(start + shard_size, size))
+			for start in range(0, max(size, 1), shard_size)
+		)
+
+	return shards
+
+
+def _get_top_k_heap_for_shard(
+	shard: Tuple[str, int, Optional[int]], engine: str, top_k: int
+) -> List[int]:
+	"""
+	Worker function which builds the top_k heap for a single shard
+
+	:param Tuple[str, int, Optional[int]] shard: (file, start, end) shard to be parsed
+	:param str engine: Name of the parsing engine to use
+	:param int top_k: Number of elves to keep track of
+	:return List[int]: Min-heap with (at most) the top_k largest calorie counts of the shard
+	"""
+	file, start, end = shard
+
+	if end is None:
+		return _get_top_k_heap(_iter_calories_for_each_elf(file, engine), top_k)
+
+	return _get_top_k_heap(_iter_calories_by_chunk(file, start, end), top_k)
+
+
+def _get_top_calories_parallel(
+	files: List[str], top_k: int = 3, engine: str = "mmap", workers: int = None,
+	shard_size: int = _SHARD_SIZE
+) -> Tuple[int, int]:
+	"""
+	Splits the provided files into shards, builds the top_k heap of each shard in a process pool
+	and merges them together. Returns a tuple containing two values: (A, B)
+
+	A = Total number of calories carried by the elf with the most calories
+	B = Sum of the top_k elves holding the most calories
+
+	:param List[str] files: Files containing the elves calories
+	:param int top_k: Number of elves to keep track of, defaults to 3
+	:param str engine: Name of the parsing engine to use, defaults to "mmap"
+	:param int workers: Number of worker processes, defaults to the number of CPUs
+	:param int shard_size: Target size of each byte range, defaults to _SHARD_SIZE
+	:return Tuple[int, int]: (A, B)
+	"""
+	shards = _get_shards(files, engine, shard_size)
+	worker = partial(_get_top_k_heap_for_shard, engine=engine, top_k=top_k)
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		heaps = list(executor.map(worker, shards))
+
+	return _get_top_calories(itertools.chain.from_iterable(heaps), top_k)
+
+
+def _expand_infiles(paths: List[str]) -> List[str]:
+	"""
+	Expands the provided input paths into a list of files. Directories are replaced by the
+	files they contain and glob patterns by the files they match.
+
+	:param List[str] paths: Files, directories or glob patterns
+	:return List[str]: Sorted list of files for each provided path
+	"""
+	files = list()
+
+	for path in paths:
+		if os.path.isdir(path):
+			files.extend(sorted(
+				os.path.join(path, file) for file in os.listdir(path)
+				if os.path.isfile(os.path.join(path, file))
+			))
+		elif os.path.exists(path):
+			files.append(path)
+		else:
+			files.extend(sorted(file for file in glob.glob(path) if os.path.isfile(file)))
+
+	return files
+
+
+_ENGINES = {
+	"lines": _iter_calories_by_line,
+	"mmap": _iter_calories_by_chunk,
+}
 
 
 def _validate_arguments(args: argparse.Namespace):
 	"""
 	This function will validate the arguments provided and raise the proper errors
 	"""
-	if not os.path.exists(args.infile):
-		raise ValueError(f"The provided file does not exist: {args.infile}")
+	for path in args.infile:
+		if not os.path.exists(path) and not glob.glob(path):
+			raise ValueError(f"The provided file does not exist: {path}")
+
+	if args.top_k < 1:
+		raise ValueError(f"The number of elves to sum must be at least 1: {args.top_k}")
+
+	if args.workers is not None and args.workers < 1:
+		raise ValueError(f"The number of workers must be at least 1: {args.workers}")
+
+	if args.shard_size < 1:
+		raise ValueError(f"The shard size must be at least 1 byte: {args.shard_size}")
 
 
 def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
@@ -77,8 +320,29 @@ def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 	parser = argparse.ArgumentParser("Counting Calories of Elves")
 
 	parser.add_argument(
-		"--infile", dest='infile', type=str, required=True,
-		help="Path to the input file containing the elves calories"
+		"--infile", dest='infile', type=str, required=True, nargs="+",
+		help="Path(s), directories or glob patterns of the input files containing the elves calories"
+	)
+
+	parser.add_argument(
+		"--top-k", dest='top_k', type=int, required=False, default=3,
+		help="Number of elves with the most calories to sum together"
+	)
+
+	parser.add_argument(
+		"--engine", dest='engine', type=str, required=False, default="lines",
+		choices=sorted(_ENGINES),
+		help="Parsing engine: 'lines' reads line by line, 'mmap' parses memory mapped chunks"
+	)
+
+	parser.add_argument(
+		"--workers", dest='workers', type=int, required=False,
+		help="Aggregate the input files in a pool of this many worker processes"
+	)
+
+	parser.add_argument(
+		"--shard-size", dest='shard_size', type=int, required=False, default=_SHARD_SIZE,
+		help="Bytes of a single file handed to each worker when using the 'mmap' engine"
 	)
 
 	args = parser.parse_args() if cmd_args is None else parser.parse_args(cmd_args)
@@ -93,7 +357,7 @@ def main(cmd_args: list = None) -> Tuple[int, int]:
 	containing two values: (A, B)
 
 	A = Total number of calories carried by the elf with the most calories
-	B = Sum of the top 3 elves holding the most calories
+	B = Sum of the top K (default 3) elves holding the most calories
 
 	Example provided in the file header
 
@@ -101,14 +365,23 @@ def main(cmd_args: list = None) -> Tuple[int, int]:
 	:return tuple[int,int]: (A, B)
 	"""
 	args = _get_arguments(cmd_args)
-	calorie_list = _get_calories_for_each_elf(args.infile)
-	sorted_calorie_list = sorted(calorie_list)
+	files = _expand_infiles(args.infile)
+
+	if args.workers:
+		return _get_top_calories_parallel(
+			files, args.top_k, args.engine, args.workers, args.shard_size
+		)
 
-	return sorted_calorie_list[-1], sum(sorted_calorie_list[-3:])
+	return _get_top_calories(
+		itertools.chain.from_iterable(
+			_iter_calories_for_each_elf(file, args.engine) for file in files
+		),
+		args.top_k
+	)
 
 
 if __name__ == '__main__':
 	top_elf, top3_elves = main()
 
 	print(f"Top Elf Calorie Count: {top_elf}")
-	print(f"Top 3 Elves Calorie Count: {top3_elves}")
+	print(f"Top K Elves Calorie Count: {top3_elves}")
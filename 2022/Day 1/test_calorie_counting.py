@@ -8,7 +8,7 @@ import os
 from typing import List
 
 import pytest
-from .calorie_counting import main
+from .calorie_counting import main, _get_calories_for_each_elf, _iter_calories_by_chunk
 
 _CUR_DIR_PATH = os.path.dirname(__file__)
 
@@ -46,15 +46,92 @@ def _build_test_suite() -> List[tuple]:
 	return list(zip(input_files, output_files))
 
 
+@pytest.mark.parametrize("engine", ["lines", "mmap"])
 @pytest.mark.parametrize("infile, outfile", _build_test_suite())
-def test_inputs(infile, outfile):
+def test_inputs(infile, outfile, engine):
 	"""
 	This function will verify that the expected input matches the expected output
 	"""
 	with open(outfile, "r") as fptr:
 		expected_output = fptr.read()
 
-	actual_output = main(['--infile', infile])
+	actual_output = main(['--infile', infile, '--engine', engine])
 
 	assert expected_output == str(actual_output), \
 		f"Expected: {expected_output} does not match actual: {str(actual_output)}"
+
+
+@pytest.mark.parametrize("top_k, expected_output", [
+	(1, (24000, 24000)),
+	(3, (24000, 45000)),
+	(5, (24000, 55000)),
+	(10, (24000, 55000)),
+])
+def test_top_k(top_k, expected_output):
+	"""
+	This function will verify that the number of elves summed together can be configured
+	"""
+	infile = os.path.join(_CUR_DIR_PATH, "test_inputs", "test_input1.txt")
+	actual_output = main(['--infile', infile, '--top-k', str(top_k)])
+
+	assert expected_output == actual_output, \
+		f"Expected: {expected_output} does not match actual: {actual_output}"
+
+
+@pytest.mark.parametrize("engine", ["lines", "mmap"])
+@pytest.mark.parametrize("contents, expected_output", [
+	("1000\r\n2000\r\n\r\n4000\r\n\r\n500\r\n", (4000, 7500)),
+	("\n\n1000\n2000\n\n\n\n4000\n\n\n", (4000, 7000)),
+	("0\n\n0\n\n5\n", (5, 5)),
+	("", (0, 0)),
+])
+def test_group_boundaries(tmp_path, contents, expected_output, engine):
+	"""
+	This function will verify that line endings, blank lines and zero calorie elves are handled
+	"""
+	infile = tmp_path / "input.txt"
+	infile.write_bytes(contents.encode())
+
+	actual_output = main(['--infile', str(infile), '--engine', engine])
+
+	assert expected_output == actual_output, \
+		f"Expected: {expected_output} does not match actual: {actual_output}"
+
+
+@pytest.mark.parametrize("shard_size", [1, 7, 64, 4096])
+@pytest.mark.parametrize("infile, _", _build_test_suite())
+def test_byte_range_shards(infile, _, shard_size):
+	"""
+	This function will verify that splitting a file into byte ranges yields every group once
+	"""
+	size = os.path.getsize(infile)
+	sharded = [
+		calories for start in range(0, size, shard_size)
+		for calories in _iter_calories_by_chunk(infile, start, start + shard_size)
+	]
+
+	assert sharded == _get_calories_for_each_elf(infile), \
+		f"Splitting {infile} into {shard_size} byte shards changed the groups"
+
+
+@pytest.mark.parametrize("engine", ["lines", "mmap"])
+def test_parallel_shards(tmp_path, engine):
+	"""
+	This function will verify that several input files are merged into a single answer
+	"""
+	with open(os.path.join(_CUR_DIR_PATH, "test_inputs", "test_input2.txt"), "r") as fptr:
+		groups = fptr.read().strip().split("\n\n")
+
+	for index in range(0, len(groups), 50):
+		(tmp_path / f"shard{index:04}.txt").write_text("\n\n".join(groups[index:index + 50]))
+
+	with open(os.path.join(_CUR_DIR_PATH, "test_outputs", "test_output2.txt"), "r") as fptr:
+		expected_output = fptr.read()
+
+	for infile in [str(tmp_path), str(tmp_path / "shard*.txt")]:
+		actual_output = main([
+			'--infile', infile, '--engine', engine, '--workers', '2', '--shard-size', '1000'
+		])
+
+		assert expected_output == str(actual_output), \
+			f"Expected: {expected_output} does not match actual: {str(actual_output)}"
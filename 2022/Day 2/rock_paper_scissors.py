@@ -59,7 +59,13 @@ Date of Creation: 12/1/2022
 import os
 import argparse
 
-from typing import Tuple
+from functools import partial
+from typing import Dict, Tuple
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional, the 'numpy' engine falls back to pure Python
+	np = None
 
 
 _WIN_AMOUNT = 6
@@ -103,39 +109,210 @@ _STRAT_MOVE_BONUS_GUIDE = {
 }
 
 
-def _get_rps_total(file: str) -> int:
+_CHUNK_SIZE = 1 << 22  # Bytes read at a time by the lookup table engine
+_ROUND_BLOCK_SIZE = 1 << 22  # Rounds scored at a time by the NumPy engine
+
+
+def _score_round(opponent: str, user: str) -> Tuple[int, int]:
 	"""
-	Opens a provided file and parses it to get the total score for Rock, Paper, Scissors
+	Scores a single round of Rock, Paper, Scissors. Returns a tuple containing two values: (A, B)
+
+	A = Score of the round when the second column is the move to play
+	B = Score of the round when the second column is the desired outcome
+
+	:param str opponent: Move played by the opponent (A, B, C)
+	:param str user: Second column of the strategy guide (X, Y, Z)
+	:return Tuple[int, int]: (A, B)
+	"""
+	# Challenge 1 Logic
+	org_rps_score = _SCORE_GUIDE[user]
+
+	if _WIN_GUIDE[user] == opponent:
+		org_rps_score += _WIN_AMOUNT
+
+	if _DRAW_GUIDE[user] == opponent:
+		org_rps_score += _DRAW_AMOUNT
+
+	if _LOSE_GUIDE[user] == opponent:
+		org_rps_score += _LOSE_AMOUNT
+
+	# Challenge 2 Logic
+	strat_rps_score = _STRAT_MOVE_BONUS_GUIDE[user]
+	user_move = _STRAT_MOVE_GUIDE[user][opponent]
+	strat_rps_score += _SCORE_GUIDE[user_move]
+
+	return org_rps_score, strat_rps_score
+
+
+# Both scores for each of the nine possible rounds, keyed by the round as written in the file
+_ROUND_SCORE_TABLE: Dict[bytes, Tuple[int, int]] = {
+	f"{opponent} {user}".encode(): _score_round(opponent, user)
+	for opponent in _DRAW_GUIDE.values() for user in _DRAW_GUIDE
+}
+
+
+def _get_rps_total_by_line(file: str) -> Tuple[int, int]:
+	"""
+	Opens a provided file and scores it one round (line) at a time
 
 	:param str file: File to be opened
-	:return int: Total rock, paper, scissors score
+	:return Tuple[int, int]: Total rock, paper, scissors scores for both challenges
 	"""
 	org_rps_score = 0
 	strat_rps_score = 0
 
 	with open(file, "r") as fptr:
 		for line in fptr:
-			# Challenge 1 Logic
-			opponent, user = line.split()
-			org_rps_score += _SCORE_GUIDE[user]
+			try:
+				opponent, user = line.split()
+				round_score, strat_round_score = _score_round(opponent, user)
+			except (KeyError, ValueError):
+				raise ValueError(
+					f"Provided file contains an invalid round: {line.strip()!r}. Please verify inputs."
+				) from None
+
+			org_rps_score += round_score
+			strat_rps_score += strat_round_score
+
+	return org_rps_score, strat_rps_score
+
+
+def _get_rps_total_by_table(file: str) -> Tuple[int, int]:
+	"""
+	Opens a provided file and counts how many times each of the nine possible rounds appears,
+	then scores the whole file as a dot product of the counts and _ROUND_SCORE_TABLE.
 
-			if _WIN_GUIDE[user] == opponent:
-				org_rps_score += _WIN_AMOUNT
+	The file is read in chunks, with the last two bytes of the previous chunk carried over so
+	that a round split between two chunks is still counted (exactly once).
 
-			if _DRAW_GUIDE[user] == opponent:
-				org_rps_score += _DRAW_AMOUNT
+	Bytes which are not part of a round would simply not be counted, so the file is verified
+	to hold exactly one round per line: there must be no blank line, as many rounds as lines
+	and no byte other than the rounds and the line endings.
 
-			if _LOSE_GUIDE[user] == opponent:
-				org_rps_score += _LOSE_AMOUNT
+	:param str file: File to be opened
+	:return Tuple[int, int]: Total rock, paper, scissors scores for both challenges
+	"""
+	counts = dict.fromkeys(_ROUND_SCORE_TABLE, 0)
+	carry = b"\n"  # Lets a blank first line be found like any other blank line
+	size = 0
+	line_ending_bytes = 0
+	num_lines = 0
+	num_blank_lines = 0
+
+	with open(file, "rb") as fptr:
+		for chunk in iter(partial(fptr.read, _CHUNK_SIZE), b""):
+			size += len(chunk)
+			num_lines += chunk.count(b"\n")
+			line_ending_bytes += chunk.count(b"\n") + chunk.count(b"\r")
+			chunk = carry + chunk
+
+			for pattern in counts:
+				counts[pattern] += chunk.count(pattern)
+
+			# Blank lines lying within the carry may be counted twice, only zero matters
+			num_blank_lines += chunk.count(b"\n\n") + chunk.count(b"\n\r\n")
+			carry = chunk[-2:]
+
+	num_lines += size > 0 and not carry.endswith(b"\n")  # The last line may not end with '\n'
+	num_rounds = sum(counts.values())
+
+	if num_blank_lines or num_rounds != num_lines or size != 3 * num_rounds + line_ending_bytes:
+		raise ValueError(
+			"Provided file is not made up of one 'A X' round per line. Please verify inputs."
+		)
+
+	org_rps_score = 0
+	strat_rps_score = 0
 
-			# Challenge 2 Logic
-			strat_rps_score += _STRAT_MOVE_BONUS_GUIDE[user]
-			user_move = _STRAT_MOVE_GUIDE[user][opponent]
-			strat_rps_score += _SCORE_GUIDE[user_move]
+	for pattern, count in counts.items():
+		round_score, strat_round_score = _ROUND_SCORE_TABLE[pattern]
+		org_rps_score += count * round_score
+		strat_rps_score += count * strat_round_score
 
 	return org_rps_score, strat_rps_score
 
 
+def _get_rps_total_by_numpy(file: str) -> Tuple[int, int]:
+	"""
+	Memory maps a provided file as a fixed stride byte array (one 'A X\n' round per row) and
+	scores blocks of rounds at a time with vectorized modular arithmetic. Moves are mapped to
+	codes 0..2 (rock, paper, scissors) so the outcome of a round is (user - opponent + 1) % 3
+	(0 = lose, 1 = draw, 2 = win) and the move needed for a desired outcome is
+	(opponent + outcome - 1) % 3.
+
+	Falls back to _get_rps_total_by_table when NumPy is not installed.
+
+	:param str file: File to be opened
+	:return Tuple[int, int]: Total rock, paper, scissors scores for both challenges
+	"""
+	if np is None:
+		return _get_rps_total_by_table(file)
+
+	size = os.path.getsize(file)
+
+	if size == 0:
+		return 0, 0
+
+	data = np.memmap(file, dtype=np.uint8, mode="r")
+	newlines = np.flatnonzero(data[:8] == ord("\n"))
+	stride = int(newlines[0]) + 1 if newlines.size else 4  # 4 for '\n', 5 for '\r\n' endings
+	num_rounds = -(-size // stride)  # The last round may not end with a newline
+
+	if stride not in (4, 5) or size < (num_rounds - 1) * stride + 3:
+		raise ValueError(
+			"Provided file is not made up of fixed width 'A X' rounds. Please verify inputs."
+		)
+
+	org_rps_score = 0
+	strat_rps_score = 0
+
+	for block_start in range(0, num_rounds, _ROUND_BLOCK_SIZE):
+		block_end = min(block_start + _ROUND_BLOCK_SIZE, num_rounds)
+		first_byte = block_start * stride
+
+		opponent = data[first_byte:block_end * stride:stride].astype(np.int64) - ord("A")
+		user = data[first_byte + 2:block_end * stride:stride].astype(np.int64) - ord("X")
+		spaces = data[first_byte + 1:block_end * stride:stride]
+
+		if (spaces != ord(" ")).any():
+			raise ValueError(
+				"Provided file is not made up of fixed width 'A X' rounds. Please verify inputs."
+			)
+
+		if opponent.min() < 0 or opponent.max() > 2 or user.min() < 0 or user.max() > 2:
+			raise ValueError(
+				"Provided file contains moves other than A-C and X-Z. Please verify inputs."
+			)
+
+		# Challenge 1 Logic
+		outcome = (user - opponent + 1) % 3
+		org_rps_score += int((user + 1).sum() + (outcome * _DRAW_AMOUNT).sum())
+
+		# Challenge 2 Logic
+		user_move = (opponent + user - 1) % 3
+		strat_rps_score += int((user * _DRAW_AMOUNT).sum() + (user_move + 1).sum())
+
+	return org_rps_score, strat_rps_score
+
+
+_ENGINES = {
+	"lines": _get_rps_total_by_line,
+	"numpy": _get_rps_total_by_numpy,
+	"table": _get_rps_total_by_table,
+}
+
+
+def _get_rps_total(file: str, engine: str = "lines") -> Tuple[int, int]:
+	"""
+	Opens a provided file and parses it to get the total score for Rock, Paper, Scissors
+
+	:param str file: File to be opened
+	:param str engine: Name of the scoring engine to use (see _ENGINES), defaults to "lines"
+	:return Tuple[int, int]: Total rock, paper, scissors scores for both challenges
+	"""
+	return _ENGINES[engine](file)
+
+
 def _validate_arguments(args: argparse.Namespace):
 	"""
 	This function will validate the arguments provided and raise the proper errors
@@ -158,6 +335,15 @@ def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 		help="Path to the input file containing the elves calories"
 	)
 
+	parser.add_argument(
+		"--engine", dest='engine', type=str, required=False, default="lines",
+		choices=sorted(_ENGINES),
+		help=(
+			"Scoring engine: 'lines' scores each round, 'table' counts each of the nine rounds,"
+			" 'numpy' scores every round in vectorized blocks (requires NumPy)"
+		)
+	)
+
 	args = parser.parse_args() if cmd_args is None else parser.parse_args(cmd_args)
 	_validate_arguments(args)
 
@@ -178,7 +364,7 @@ def main(cmd_args: list = None) -> Tuple[int, int]:
 	:return tuple[int,int]: (A, B)
 	"""
 	args = _get_arguments(cmd_args)
-	rps_score_total, strat_rps_score_total = _get_rps_total(args.infile)
+	rps_score_total, strat_rps_score_total = _get_rps_total(args.infile, args.engine)
 
 	return rps_score_total, strat_rps_score_total
 
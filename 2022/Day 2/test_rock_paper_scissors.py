@@ -46,15 +46,32 @@ def _build_test_suite() -> List[tuple]:
 	return list(zip(input_files, output_files))
 
 
+@pytest.mark.parametrize("engine", ["lines", "numpy", "table"])
 @pytest.mark.parametrize("infile, outfile", _build_test_suite())
-def test_inputs(infile, outfile):
+def test_inputs(infile, outfile, engine):
 	"""
 	This function will verify that the expected input matches the expected output
 	"""
 	with open(outfile, "r") as fptr:
 		expected_output = fptr.read()
 
-	actual_output = main(['--infile', infile])
+	actual_output = main(['--infile', infile, '--engine', engine])
 
 	assert expected_output == str(actual_output), \
 		f"Expected: {expected_output} does not match actual: {str(actual_output)}"
+
+
+@pytest.mark.parametrize("engine", ["lines", "numpy", "table"])
+@pytest.mark.parametrize("rounds", [
+	b"A X\nA  Y\nD Z\nB Y\n", b"A X\n\nB Y\n", b"\r\nA X\r\nB Y", b"A XB Y\n\n", b"A X\nB Yjunk\n"
+])
+def test_malformed_input(tmp_path, rounds, engine):
+	"""
+	This function will verify that every engine rejects a file which is not made up of one round
+	per line, rather than scoring the rounds it does recognize
+	"""
+	infile = tmp_path / "input.txt"
+	infile.write_bytes(rounds)
+
+	with pytest.raises(ValueError, match="Please verify inputs."):
+		main(['--infile', str(infile), '--engine', engine])
@@ -55,14 +55,55 @@ Date of Creation: 12/3/2022
 """
 import os
 import argparse
+import operator
 
-from typing import Tuple
+from functools import reduce
+from typing import List, Tuple
 
 _BASE_LOWERCASE_PRIORITY = 1
 _BASE_UPPERCASE_PRIORITY = 27
+_NUM_ITEM_TYPES = 52  # a-z and A-Z, each gets one bit of an item mask
 
 
-def _get_total_priority(file: str) -> Tuple[int, int]:
+def _build_priority_table() -> List[int]:
+	"""
+	Builds a table mapping every possible byte of an item to its priority. Bytes which are not
+	a letter have a priority of 0.
+
+	:return List[int]: 256 entry table of priorities
+	"""
+	table = [0] * 256
+
+	for offset in range(26):
+		table[ord('a') + offset] = offset + _BASE_LOWERCASE_PRIORITY
+		table[ord('A') + offset] = offset + _BASE_UPPERCASE_PRIORITY
+
+	return table
+
+
+# Priority of each possible item byte, 0 if the byte is not a letter
+_PRIORITY_TABLE: List[int] = _build_priority_table()
+
+# Bit of each possible item byte. Letters use bit (priority - 1), so a mask of a single letter
+# has a bit_length() equal to its priority. Any other byte gets a bit above _NUM_ITEM_TYPES so
+# that it can still be detected as a common item.
+_BIT_TABLE: List[int] = [
+	1 << (priority - 1) if priority else 1 << (_NUM_ITEM_TYPES + byte)
+	for byte, priority in enumerate(_PRIORITY_TABLE)
+]
+
+
+def _get_item_mask(items: bytes) -> int:
+	"""
+	Builds a bitmask of the items in a rucksack (or container) using _BIT_TABLE
+
+	:param bytes items: Items to be added to the mask
+	:return int: Bitmask of the items
+	"""
+	return reduce(operator.or_, map(_BIT_TABLE.__getitem__, items), 0)
+
+
+def _get_total_priority(file: str, group_size: int = 3) -> Tuple[int, int]:
 	"""
 	Opens a provided file and parses it to get the rucksack items. Returns a tuple
 	containing two values: (A, B)
@@ -70,75 +111,71 @@ def _get_total_priority(file: str) -> Tuple[int, int]:
 	A = Total priority of the back rucksack items
 	B = Total priority of the badges of authenticity
 
+	The badge of each group is found by folding the item mask of each rucksack into a running
+	AND, so only a single mask is kept around no matter how large the groups are. Rucksacks
+	left over at the end of the file which do not make up a full group are ignored.
+
 	:param str file: File to be opened
+	:param int group_size: Number of rucksacks (lines) in each group, defaults to 3
 	:return tuple[int,int]: (A, B)
 	"""
 
-	def validate_input(item: str):
+	def validate_input(common_items: int):
 		"""
 		Validates that the provided input is valid given the constraints of the problem.
 
-		The provided value should be of length 1 and needs to be a letter.
+		The provided mask should have exactly one bit set and that bit needs to be a letter.
 
-		:param str item: Item to be evaluated.
+		:param int common_items: Bitmask of the items in common.
 		:return: N/A
 		"""
-		if len(item) != 1:
+		if not common_items or common_items & (common_items - 1):
 			raise ValueError(
 				"Provided rucksack contains two bad values. Please verify inputs."
 			)
 
-		if not str(item[0]).isalpha():
+		if common_items >> _NUM_ITEM_TYPES:
 			raise ValueError(
 				"Provided value is not a value between a-z or A-Z. Please verify inputs."
 			)
 
 	priority_sum = 0
 	badge_priority_sum = 0
-	rucksack_trio = list()
+	group_items = -1  # All bits set, the identity value for AND
+	group_count = 0
 
-	with open(file, "r") as fptr:
+	with open(file, "rb") as fptr:
 		for rucksack in fptr:
-			rucksack = rucksack.strip("\n\r")
-			rucksack_trio.append(rucksack)
+			rucksack = rucksack.strip(b"\n\r")
 
 			# Challenge 1 Logic
 			size = len(rucksack)
 			if size % 2:
 				raise ValueError(
-					f"Provided rucksack ({rucksack}) does not contain an even number of entries"
-					f" ({size}). Please verify inputs."
+					f"Provided rucksack ({rucksack.decode(errors='replace')}) does not contain an"
+					f" even number of entries ({size}). Please verify inputs."
 				)
 
 			# pylint: disable=invalid-name
-			c1 = rucksack[:int(size / 2)]	 # Large container 1
-			c2 = rucksack[int(size / 2):]	 # Large container 2
+			c1 = _get_item_mask(rucksack[:size // 2])	 # Large container 1
+			c2 = _get_item_mask(rucksack[size // 2:])	 # Large container 2
 
-			item = list(set(c1).intersection(c2))
+			item = c1 & c2
 			validate_input(item)
 
-			item = item[0]
-
-			if item.isupper():
-				priority_sum += ord(item) - ord('A') + _BASE_UPPERCASE_PRIORITY
-			else:
-				priority_sum += ord(item) - ord('a') + _BASE_LOWERCASE_PRIORITY
+			priority_sum += item.bit_length()
 
 			# Challenge 2 Logic
-			if len(rucksack_trio) == 3:
-				r1, r2, r3 = rucksack_trio  # pylint: disable=unbalanced-tuple-unpacking
-
-				item = list(set(r1).intersection(set(r2)).intersection(set(r3)))
-				validate_input(item)
+			group_items &= c1 | c2
+			group_count += 1
 
-				item = item[0]
+			if group_count == group_size:
+				validate_input(group_items)
 
-				if item.isupper():
-					badge_priority_sum += ord(item) - ord('A') + _BASE_UPPERCASE_PRIORITY
-				else:
-					badge_priority_sum += ord(item) - ord('a') + _BASE_LOWERCASE_PRIORITY
+				badge_priority_sum += group_items.bit_length()
 
-				rucksack_trio = list()
+				group_items = -1
+				group_count = 0
 
 			# pylint: enable=invalid-name
 
@@ -152,6 +189,9 @@ def _validate_arguments(args: argparse.Namespace):
 	if not os.path.exists(args.infile):
 		raise ValueError("The provided file does not exist")
 
+	if args.group_size < 1:
+		raise ValueError(f"The group size must be at least 1: {args.group_size}")
+
 
 def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 	"""
@@ -167,6 +207,11 @@ def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 		help="Path to the input file containing the elves calories"
 	)
 
+	parser.add_argument(
+		"--group-size", dest='group_size', type=int, required=False, default=3,
+		help="Number of rucksacks in each group sharing a badge"
+	)
+
 	args = parser.parse_args() if cmd_args is None else parser.parse_args(cmd_args)
 	_validate_arguments(args)
 
@@ -188,7 +233,9 @@ def main(cmd_args: list = None) -> Tuple[int, int]:
 	"""
 	# pylint: disable=redefined-outer-name
 	args = _get_arguments(cmd_args)
-	total_bad_item_priority, total_badge_item_priority = _get_total_priority(args.infile)
+	total_bad_item_priority, total_badge_item_priority = _get_total_priority(
+		args.infile, args.group_size
+	)
 
 	return total_bad_item_priority, total_badge_item_priority
 
@@ -58,3 +58,38 @@ def test_inputs(infile, outfile):
 
 	assert expected_output == str(actual_output), \
 		f"Expected: {expected_output} does not match actual: {str(actual_output)}"
+
+
+@pytest.mark.parametrize("contents, error", [
+	("abcabd\n", "two bad values"),
+	("abcxyz\n", "two bad values"),
+	("ab1cd1\n", "between a-z or A-Z"),
+	("abcab\n", "even number of entries"),
+])
+def test_invalid_rucksacks(tmp_path, contents, error):
+	"""
+	This function will verify that rucksacks breaking the problem constraints are rejected
+	"""
+	infile = tmp_path / "input.txt"
+	infile.write_text(contents)
+
+	with pytest.raises(ValueError, match=error):
+		main(['--infile', str(infile)])
+
+
+@pytest.mark.parametrize("contents, group_size, expected_output", [
+	("aa\nbb\n", 1, (3, 3)),
+	("abca\naxyx\n", 2, (25, 1)),
+	("abca\naxyx\nzz\n", 2, (51, 1)),
+])
+def test_group_size(tmp_path, contents, group_size, expected_output):
+	"""
+	This function will verify that the number of rucksacks in a group can be configured
+	"""
+	infile = tmp_path / "input.txt"
+	infile.write_text(contents)
+
+	actual_output = main(['--infile', str(infile), '--group-size', str(group_size)])
+
+	assert expected_output == actual_output, \
+		f"Expected: {expected_output} does not match actual: {actual_output}"
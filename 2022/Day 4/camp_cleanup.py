@@ -48,56 +48,143 @@ Example:
 	Challenge 2 Answer: Report back '4' as pairs 3, 4, 5, and 6 all have ranges which overlap
 	the other to some degree.
 
+Queries:
+	Every assignment in the file can also be indexed to answer questions across the whole
+	roster rather than per pair -
+
+	`stab SECTION`: List every assignment which contains the given section
+	`overlaps`: List every pair of assignments (from any two lines) which overlap
+
+	Using the example above, `stab 4` reports pair 1 elf 1 (2-4), pair 2 elf 2 (4-5),
+	pair 4 elf 1 (2-8), pair 4 elf 2 (3-7), pair 5 elf 2 (4-6), pair 6 elf 1 (2-6)
+	and pair 6 elf 2 (4-8).
+
 Author: Ryan Lanciloti
 Date of Creation: 12/3/2022
 """
 import os
 import argparse
+import re
+
+from typing import Iterator, List, Tuple, Union
 
-from typing import Tuple
+from camp_cleanup_classes import Assignment, IntervalIndex
 
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional, the 'numpy' engine falls back to pure Python
+	np = None
 
-def _get_total_redundant_ranges(file: str) -> Tuple[int, int]:
+# Matches a line of the form 'A-B,C-D' and captures the four section IDs
+_RANGE_PAIR_PATTERN = re.compile(rb"\s*(\d+)-(\d+),(\d+)-(\d+)\s*")
+
+
+def _iter_range_pairs(file: str) -> Iterator[Tuple[int, int, int, int]]:
 	"""
-	Opens a provided file and parses it to get the different search ranges that fully enclose
-	one another. Returns a tuple containing two values: (A, B)
+	Opens a provided file and lazily yields each pair of ranges as the four section IDs
+	(range 1 start, range 1 end, range 2 start, range 2 end). Blank lines are skipped.
+
+	:param str file: File to be opened
+	:return Iterator[Tuple[int, int, int, int]]: Iterator over each pair of ranges
+	"""
+	with open(file, "rb") as fptr:
+		for line in fptr:
+			match = _RANGE_PAIR_PATTERN.fullmatch(line)
+
+			if match is None:
+				if not line.strip():
+					continue
+
+				raise ValueError(
+					f"Provided line ({line.decode(errors='replace').strip()}) is not a pair of"
+					" ranges. Please verify inputs."
+				)
+
+			start1, end1, start2, end2 = match.groups()
+			yield int(start1), int(end1), int(start2), int(end2)
 
-	A = Total number of ranges which enclose the other
-	B = Total number of ranges that overlap the other at all
+
+def _get_total_redundant_ranges_by_line(file: str) -> Tuple[int, int]:
+	"""
+	Counts the redundant and overlapping ranges one pair at a time. Two inclusive ranges overlap
+	when each one starts before the other ends, and one contains the other when the starts and
+	the ends are ordered in opposite directions (or are equal).
 
 	:param str file: File to be opened
 	:return tuple[int,int]: (A, B)
 	"""
-	# pylint: disable=redefined-outer-name
 	total_redundant_ranges = 0
 	total_overlapping_ranges = 0
 
-	with open(file, "r") as fptr:
-		for ranges in fptr:
-			range1, range2 = ranges.strip("\n\r").split(",")
-			range1 = [int(val) for val in range1.split("-")]
-			range2 = [int(val) for val in range2.split("-")]
-
-			if (
-				(range1[0] <= range2[0] and range1[1] >= range2[1]) or 	# Case: Range 2 is inside of range 1
-				(range1[0] >= range2[0] and range1[1] <= range2[1])   	# Case: Range 1 is inside of range 2
-			):
-				total_redundant_ranges += 1
-				total_overlapping_ranges += 1
-			else:
-				if (
-					# pylint: disable=line-too-long,too-many-boolean-expressions
-					(range1[0] <= range2[0] and range1[1] >= range2[0]) or  # Case: Range 1 encompasses range 2 lower bound  # noqa: E501
-					(range1[0] <= range2[1] and range1[1] >= range2[1]) or  # Case: Range 1 encompasses range 2 upper bound  # noqa: E501
-					(range2[0] <= range1[0] and range2[1] >= range1[0]) or  # Case: Range 2 encompasses range 1 lower bound  # noqa: E501
-					(range2[0] <= range1[1] and range2[1] >= range1[1])		# Case: Range 2 encompasses range 1 upper bound  # noqa: E501
-					# pylint: enable=line-too-long,too-many-boolean-expressions
-				):
-					total_overlapping_ranges += 1
+	for start1, end1, start2, end2 in _iter_range_pairs(file):
+		if (start1 - start2) * (end1 - end2) <= 0:
+			total_redundant_ranges += 1
+
+		if start1 <= end2 and start2 <= end1:
+			total_overlapping_ranges += 1
 
 	return total_redundant_ranges, total_overlapping_ranges
 
 
+def _get_total_redundant_ranges_by_numpy(file: str) -> Tuple[int, int]:
+	"""
+	Loads every pair of ranges into a (n, 4) integer array and evaluates the same formulas as
+	_get_total_redundant_ranges_by_line on all of the pairs at once.
+
+	Falls back to _get_total_redundant_ranges_by_line when NumPy is not installed.
+
+	:param str file: File to be opened
+	:return tuple[int,int]: (A, B)
+	"""
+	if np is None:
+		return _get_total_redundant_ranges_by_line(file)
+
+	with open(file, "rb") as fptr:
+		data = fptr.read()
+
+	try:
+		sections = np.fromstring(
+			data.translate(bytes.maketrans(b"-,", b"  ")), dtype=np.int64, sep=" "
+		)
+	except ValueError:
+		raise ValueError(
+			"Provided file contains lines which are not a pair of ranges. Please verify inputs."
+		) from None
+
+	if sections.size != 4 * data.count(b","):
+		raise ValueError(
+			"Provided file contains lines which are not a pair of ranges. Please verify inputs."
+		)
+
+	start1, end1, start2, end2 = sections.reshape(-1, 4).T
+
+	total_redundant_ranges = np.count_nonzero((start1 - start2) * (end1 - end2) <= 0)
+	total_overlapping_ranges = np.count_nonzero((start1 <= end2) & (start2 <= end1))
+
+	return int(total_redundant_ranges), int(total_overlapping_ranges)
+
+
+_ENGINES = {
+	"lines": _get_total_redundant_ranges_by_line,
+	"numpy": _get_total_redundant_ranges_by_numpy,
+}
+
+
+def _get_total_redundant_ranges(file: str, engine: str = "lines") -> Tuple[int, int]:
+	"""
+	Opens a provided file and parses it to get the different search ranges that fully enclose
+	one another. Returns a tuple containing two values: (A, B)
+
+	A = Total number of ranges which enclose the other
+	B = Total number of ranges that overlap the other at all
+
+	:param str file: File to be opened
+	:param str engine: Name of the counting engine to use (see _ENGINES), defaults to "lines"
+	:return tuple[int,int]: (A, B)
+	"""
+	return _ENGINES[engine](file)
+
+
 def _validate_arguments(args: argparse.Namespace):
 	"""
 	This function will validate the arguments provided and raise the proper errors
@@ -120,13 +207,35 @@ def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 		help="Path to the input file containing the elves calories"
 	)
 
+	parser.add_argument(
+		"--engine", dest='engine', type=str, required=False, default="lines",
+		choices=sorted(_ENGINES),
+		help="Counting engine: 'lines' checks a pair at a time, 'numpy' checks every pair at once"
+	)
+
+	subparsers = parser.add_subparsers(
+		dest='command', required=False,
+		help="Optional query to run against every assignment instead of counting pairs"
+	)
+
+	stab_parser = subparsers.add_parser(
+		"stab", help="List every assignment which contains a given section"
+	)
+	stab_parser.add_argument("section", type=int, help="Section to be queried")
+
+	subparsers.add_parser(
+		"overlaps", help="List every pair of assignments across the roster which overlap"
+	)
+
 	args = parser.parse_args() if cmd_args is None else parser.parse_args(cmd_args)
 	_validate_arguments(args)
 
 	return args
 
 
-def main(cmd_args: list = None) -> Tuple[int, int]:
+def main(
+	cmd_args: list = None
+) -> Union[Tuple[int, int], List[Assignment], List[Tuple[Assignment, Assignment]]]:
 	"""
 	Main function which will act as an entry point for this script. Returns a tuple
 	containing two values: (A, B)
@@ -134,6 +243,9 @@ def main(cmd_args: list = None) -> Tuple[int, int]:
 	A = Number of ranges which fully enclose eachother
 	B = Number of ranges which overlap at all
 
+	When a query is provided the result of the query is returned instead, either the list of
+	assignments containing the section ('stab') or the list of overlapping pairs ('overlaps').
+
 	Example provided in the file header
 
 	:param list cmd_args: Optional list of commandline arguments, defaults to None
@@ -141,13 +253,30 @@ def main(cmd_args: list = None) -> Tuple[int, int]:
 	"""
 	# pylint: disable=redefined-outer-name
 	args = _get_arguments(cmd_args)
-	total_range_overlaps, total_overlapping_ranges = _get_total_redundant_ranges(args.infile)
+
+	if args.command is not None:
+		index = IntervalIndex.from_range_pairs(_iter_range_pairs(args.infile))
+
+		if args.command == "stab":
+			return index.stab(args.section)
+
+		return list(index.overlapping_pairs())
+
+	total_range_overlaps, total_overlapping_ranges = _get_total_redundant_ranges(
+		args.infile, args.engine
+	)
 
 	return total_range_overlaps, total_overlapping_ranges
 
 
 if __name__ == '__main__':
-	total_range_overlaps, total_overlapping_ranges = main()
+	retval = main()
+
+	if isinstance(retval, list):
+		for item in retval:
+			print(item if isinstance(item, Assignment) else f"{item[0]} overlaps {item[1]}")
+	else:
+		total_range_overlaps, total_overlapping_ranges = retval
 
-	print(f"Total fully contained overlapping search ranges: {total_range_overlaps}")
-	print(f"Total overlapping search ranges: {total_overlapping_ranges}")
+		print(f"Total fully contained overlapping search ranges: {total_range_overlaps}")
+		print(f"Total overlapping search ranges: {total_overlapping_ranges}")
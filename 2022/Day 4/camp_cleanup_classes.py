@@ -0,0 +1,163 @@
+"""
+This file will contain the classes used in the camp_cleanup.py script
+"""
+from __future__ import annotations
+
+import heapq
+
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class Assignment(NamedTuple):
+	"""
+	Assignment: Represents the range of sections assigned to one elf of a pair
+	"""
+	pair: int   # Index of the pair (line) in the input file
+	elf: int    # Index of the elf within the pair (0 or 1)
+	start: int  # First section of the range (inclusive)
+	end: int    # Last section of the range (inclusive)
+
+	def __str__(self) -> str:
+		return f"Pair {self.pair + 1}, elf {self.elf + 1}: {self.start}-{self.end}"
+
+
+class _Node:
+	"""
+	_Node: Represents a node of the centered interval tree used by IntervalIndex
+	"""
+	__slots__ = ("center", "by_start", "by_end", "left", "right")
+
+	def __init__(self, center: int, assignments: List[Assignment]):
+		"""
+		Constructor for the _Node class
+
+		:param int center: Section this node is centered on
+		:param List[Assignment] assignments: Assignments which contain the center section
+		"""
+		self.center: int = center
+		self.by_start: List[Assignment] = sorted(assignments, key=lambda x: x.start)
+		self.by_end: List[Assignment] = sorted(assignments, key=lambda x: x.end, reverse=True)
+		self.left: Optional[_Node] = None
+		self.right: Optional[_Node] = None
+
+
+class IntervalIndex:
+	"""
+	IntervalIndex: Static index over every assignment of the roster which can answer which
+	assignments contain a given section and which assignments overlap one another
+	"""
+
+	def __init__(self, assignments: Iterable[Assignment]):
+		"""
+		Constructor for the IntervalIndex class
+
+		:param Iterable[Assignment] assignments: Assignments to be indexed
+		"""
+		self._assignments: List[Assignment] = list(assignments)
+		self._by_start: List[Assignment] = sorted(self._assignments, key=lambda x: x.start)
+		self._root: Optional[_Node] = self._build(self._assignments)
+
+	@classmethod
+	def from_range_pairs(
+		cls, range_pairs: Iterable[Tuple[int, int, int, int]]
+	) -> IntervalIndex:
+		"""
+		Builds an index from (range 1 start, range 1 end, range 2 start, range 2 end) tuples
+
+		:param Iterable[Tuple[int, int, int, int]] range_pairs: Pairs of ranges to be indexed
+		:return IntervalIndex: Index over both assignments of every pair
+		"""
+		def iter_assignments() -> Iterator[Assignment]:
+			"""
+			Helper function which splits each pair of ranges into its two assignments
+
+			:return Iterator[Assignment]: Iterator over every assignment
+			"""
+			for pair, (start1, end1, start2, end2) in enumerate(range_pairs):
+				yield Assignment(pair, 0, start1, end1)
+				yield Assignment(pair, 1, start2, end2)
+
+		return cls(iter_assignments())
+
+	@staticmethod
+	def _build(assignments: List[Assignment]) -> Optional[_Node]:
+		"""
+		Builds a centered interval tree. Each node is centered on the median section of the
+		endpoints below it, so every node holds at least one assignment and the depth of the
+		tree is O(log n).
+
+		:param List[Assignment] assignments: Assignments to be placed in the tree
+		:return Optional[_Node]: Root of the tree, None if there are no assignments
+		"""
+		if not assignments:
+			return None
+
+		endpoints = sorted(
+			section for assignment in assignments
+			for section in (assignment.start, assignment.end)
+		)
+		center = endpoints[len(endpoints) // 2]
+
+		left = [item for item in assignments if item.end < center]
+		right = [item for item in assignments if item.start > center]
+		middle = [item for item in assignments if item.start <= center <= item.end]
+
+		node = _Node(center, middle)
+		node.left = IntervalIndex._build(left)
+		node.right = IntervalIndex._build(right)
+
+		return node
+
+	def __len__(self) -> int:
+		return len(self._assignments)
+
+	def stab(self, section: int) -> List[Assignment]:
+		"""
+		Returns every assignment which contains the given section in O(log n + k)
+
+		:param int section: Section to be queried
+		:return List[Assignment]: Assignments containing the section, ordered by pair and elf
+		"""
+		found = list()
+		node = self._root
+
+		while node is not None:
+			if section < node.center:
+				for assignment in node.by_start:
+					if assignment.start > section:
+						break
+					found.append(assignment)
+				node = node.left
+
+			elif section > node.center:
+				for assignment in node.by_end:
+					if assignment.end < section:
+						break
+					found.append(assignment)
+				node = node.right
+
+			else:
+				found.extend(node.by_start)
+				break
+
+		found.sort()
+		return found
+
+	def overlapping_pairs(self) -> Iterator[Tuple[Assignment, Assignment]]:
+		"""
+		Lazily yields every pair of assignments (across the whole roster) which share at least
+		one section. A sweep over the assignments in order of their first section keeps a heap of
+		the assignments still open, so this runs in O(n log n + k).
+
+		:return Iterator[Tuple[Assignment, Assignment]]: Iterator over overlapping assignments
+		"""
+		active: List[Tuple[int, int]] = list()  # (end, position in self._by_start)
+
+		for position, assignment in enumerate(self._by_start):
+			while active and active[0][0] < assignment.start:
+				heapq.heappop(active)
+
+			for _, other in active:
+				yield self._by_start[other], assignment
+
+			heapq.heappush(active, (assignment.end, position))
@@ -8,7 +8,8 @@ import os
 from typing import List
 
 import pytest
-from camp_cleanup import main
+from camp_cleanup import main, _iter_range_pairs
+from camp_cleanup_classes import IntervalIndex
 
 _CUR_DIR_PATH = os.path.dirname(__file__)
 
@@ -46,15 +47,79 @@ def _build_test_suite() -> List[tuple]:
 	return list(zip(input_files, output_files))
 
 
+@pytest.mark.parametrize("engine", ["lines", "numpy"])
 @pytest.mark.parametrize("infile, outfile", _build_test_suite())
-def test_inputs(infile, outfile):
+def test_inputs(infile, outfile, engine):
 	"""
 	This function will verify that the expected input matches the expected output
 	"""
 	with open(outfile, "r") as fptr:
 		expected_output = fptr.read()
 
-	actual_output = main(['--infile', infile])
+	actual_output = main(['--infile', infile, '--engine', engine])
 
 	assert expected_output == str(actual_output), \
 		f"Expected: {expected_output} does not match actual: {str(actual_output)}"
+
+
+@pytest.mark.parametrize("engine", ["lines", "numpy"])
+@pytest.mark.parametrize("pairs", [b"2-4,6-8\n2-3,4-x\n", b"2-4,6-8\n2-3\n", b"2-4,6-8,1-2\n"])
+def test_malformed_input(tmp_path, pairs, engine):
+	"""
+	This function will verify that every engine rejects lines which are not a pair of ranges
+	"""
+	infile = tmp_path / "input.txt"
+	infile.write_bytes(pairs)
+
+	with pytest.raises(ValueError, match="Please verify inputs."):
+		main(['--infile', str(infile), '--engine', engine])
+
+
+def _get_assignments(infile: str) -> List[tuple]:
+	"""
+	This function will list every (pair, elf, start, end) assignment in the given input file
+
+	:return List[tuple]: List of assignments
+	"""
+	return [
+		(pair, elf, start, end)
+		for pair, ranges in enumerate(_iter_range_pairs(infile))
+		for elf, (start, end) in enumerate([ranges[:2], ranges[2:]])
+	]
+
+
+@pytest.mark.parametrize("infile, _", _build_test_suite())
+def test_stab_query(infile, _):
+	"""
+	This function will verify the 'stab' query against a brute force search
+	"""
+	assignments = _get_assignments(infile)
+	index = IntervalIndex.from_range_pairs(_iter_range_pairs(infile))
+
+	for section in range(0, max(item[3] for item in assignments) + 2):
+		expected_output = [item for item in assignments if item[2] <= section <= item[3]]
+		actual_output = index.stab(section)
+
+		assert expected_output == actual_output, \
+			f"Expected: {expected_output} does not match actual: {actual_output}"
+
+	assert index.stab(4) == main(['--infile', infile, 'stab', '4'])
+
+
+def test_overlaps_query():
+	"""
+	This function will verify the 'overlaps' query against a brute force search
+	"""
+	infile = os.path.join(_CUR_DIR_PATH, "test_inputs", "test_input1.txt")
+	assignments = _get_assignments(infile)
+
+	expected_output = {
+		(first, second) for index, first in enumerate(assignments)
+		for second in assignments[index + 1:]
+		if first[2] <= second[3] and second[2] <= first[3]
+	}
+	actual_output = main(['--infile', infile, 'overlaps'])
+
+	assert len(expected_output) == len(actual_output) and expected_output == {
+		tuple(sorted(pair)) for pair in actual_output
+	}, "The overlapping pairs do not match a brute force search"
@@ -0,0 +1,223 @@
+"""
+This script will benchmark the simulation engines of the supply stacks challenge against one
+another on randomly generated crate yards where each move transfers a large number of crates.
+With '--parser', the move parser is instead benchmarked against a plain split() followed by
+three int() calls on the move statements of the generated crate yard.
+
+Example:
+	python benchmark_supply_stacks.py --num-stacks 9 --stack-height 20000 --num-moves 2000
+	python benchmark_supply_stacks.py --num-moves 200000 --parser
+
+Author: Ryan Lanciloti
+Date of Creation: 10/17/26
+"""
+import argparse
+import random
+import time
+
+from typing import Dict, List, Tuple
+
+from supply_stacks import _ENGINES, _do_moves, _get_top_crates, _parse_move
+
+
+def _generate_crate_yard(
+	args: argparse.Namespace
+) -> Tuple[List[bytearray], List[Tuple[int, int, int]]]:
+	"""
+	This function will generate a random starting configuration and a list of valid moves
+
+	:param argparse.Namespace args: Namespace with the benchmark parameters
+	:return Tuple[List[bytearray], List[Tuple[int, int, int]]]: (stacks, moves)
+	"""
+	rng = random.Random(args.seed)
+	crate_names = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+	stacks = [
+		bytearray(rng.choice(crate_names) for _ in range(args.stack_height))
+		for _ in range(args.num_stacks)
+	]
+
+	heights = [len(stack) for stack in stacks]
+	moves = list()
+
+	for _ in range(args.num_moves):
+		move_from = rng.choice([pos for pos, height in enumerate(heights) if height])
+		move_to = rng.randrange(args.num_stacks)
+		num_crates = rng.randint(1, min(heights[move_from], args.max_move_size))
+
+		heights[move_from] -= num_crates
+		heights[move_to] += num_crates
+		moves.append((num_crates, move_from, move_to))
+
+	return stacks, moves
+
+
+def _run_benchmark(args: argparse.Namespace) -> Dict[str, float]:
+	"""
+	This function will time every simulation engine on the same crate yard and verify that
+	they all agree on the top crates
+
+	:param argparse.Namespace args: Namespace with the benchmark parameters
+	:return Dict[str, float]: Best time (in seconds) of each engine
+	"""
+	stacks, moves = _generate_crate_yard(args)
+
+	timings = dict()
+	answers = dict()
+
+	for engine in args.engines:
+		best = float("inf")
+
+		for _ in range(args.repeat):
+			start = time.perf_counter()
+			c1_stack, c2_stack = _do_moves(stacks, moves, engine)
+			best = min(best, time.perf_counter() - start)
+
+		timings[engine] = best
+		answers[engine] = (_get_top_crates(c1_stack), _get_top_crates(c2_stack))
+
+	if len(set(answers.values())) > 1:
+		raise RuntimeError(f"The engines do not agree on the top crates: {answers}")
+
+	return timings
+
+
+def _parse_move_by_int(line: str) -> Tuple[int, int, int]:
+	"""
+	Reference move parser which converts every number with int()
+
+	:param str line: move statement to be parsed
+	:return Tuple[int, int, int]: parsed move statement assembled as a tuple
+	"""
+	_, num_crates, _, move_from, _, move_to = line.split()
+	return int(num_crates), int(move_from) - 1, int(move_to) - 1
+
+
+def _run_parser_benchmark(args: argparse.Namespace) -> Dict[str, float]:
+	"""
+	This function will time the move parser and the reference parser on the move statements of
+	a generated crate yard and verify that they agree
+
+	:param argparse.Namespace args: Namespace with the benchmark parameters
+	:return Dict[str, float]: Best time (in seconds) of each parser
+	"""
+	_, moves = _generate_crate_yard(args)
+	lines = [
+		f"move {num_crates} from {move_from + 1} to {move_to + 1}\n"
+		for num_crates, move_from, move_to in moves
+	]
+
+	parsers = {"int": _parse_move_by_int, "cached": _parse_move}
+	timings = dict()
+	answers = dict()
+
+	for name, parse_move in parsers.items():
+		best = float("inf")
+
+		for _ in range(args.repeat):
+			start = time.perf_counter()
+			parsed = [parse_move(line) for line in lines]
+			best = min(best, time.perf_counter() - start)
+
+		timings[name] = best
+		answers[name] = parsed
+
+	if answers["int"] != answers["cached"] or answers["int"] != moves:
+		raise RuntimeError("The move parsers do not agree on the moves")
+
+	return timings
+
+
+def _validate_arguments(args: argparse.Namespace):
+	"""
+	This function will validate the arguments provided and raise the proper errors
+
+	:param argparse.Namespace args: Namespace with the correct arguments
+	"""
+	for name in ("num_stacks", "stack_height", "max_move_size", "repeat"):
+		if getattr(args, name) < 1:
+			raise ValueError(f"The value of '{name}' must be at least 1")
+
+	if args.num_moves < 0:
+		raise ValueError("The number of moves can not be negative")
+
+
+def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
+	"""
+	Parses through the commandline arguments and returns the namespace with the
+	parsed values.
+
+	:return argparse.Namespace: Object containing the commandline arguments
+	"""
+	parser = argparse.ArgumentParser("Supply Stacks Benchmark")
+
+	parser.add_argument(
+		"--num-stacks", dest='num_stacks', type=int, required=False, default=9,
+		help="Number of stacks in the crate yard"
+	)
+
+	parser.add_argument(
+		"--stack-height", dest='stack_height', type=int, required=False, default=20000,
+		help="Number of crates each stack starts with"
+	)
+
+	parser.add_argument(
+		"--num-moves", dest='num_moves', type=int, required=False, default=2000,
+		help="Number of moves to simulate"
+	)
+
+	parser.add_argument(
+		"--max-move-size", dest='max_move_size', type=int, required=False, default=10000,
+		help="Largest number of crates moved by a single move"
+	)
+
+	parser.add_argument(
+		"--engine", dest='engines', type=str, required=False, action="append",
+		choices=sorted(_ENGINES),
+		help="Engine to benchmark, can be provided multiple times (defaults to every engine)"
+	)
+
+	parser.add_argument(
+		"--repeat", dest='repeat', type=int, required=False, default=3,
+		help="Number of times each engine is run, the best time is reported"
+	)
+
+	parser.add_argument(
+		"--parser", dest='parser', action="store_true",
+		help="Benchmark the move parser instead of the engines"
+	)
+
+	parser.add_argument(
+		"--seed", dest='seed', type=int, required=False, default=0,
+		help="Seed used to generate the crate yard"
+	)
+
+	args = parser.parse_args() if cmd_args is None else parser.parse_args(cmd_args)
+	args.engines = args.engines or sorted(_ENGINES)
+	_validate_arguments(args)
+
+	return args
+
+
+def main(cmd_args: list = None) -> Dict[str, float]:
+	"""
+	Main function which will act as an entry point for this script. Returns the best time
+	(in seconds) of each benchmarked engine, or of each move parser with '--parser'.
+
+	:param list cmd_args: Optional list of commandline arguments, defaults to None
+	:return Dict[str, float]: Best time of each engine (or parser)
+	"""
+	args = _get_arguments(cmd_args)
+
+	if args.parser:
+		return _run_parser_benchmark(args)
+
+	return _run_benchmark(args)
+
+
+if __name__ == '__main__':
+	engine_timings = main()
+	baseline = max(engine_timings.values())
+
+	for engine_name, timing in sorted(engine_timings.items(), key=lambda x: x[1]):
+		print(f"{engine_name:>10}: {timing * 1000:10.2f} ms ({baseline / timing:6.1f}x)")
@@ -69,65 +69,188 @@ Date of Creation: 12/4/2022
 """
 import os
 import argparse
-import copy
 
-from typing import Tuple, List
+from typing import Iterable, Iterator, List, TextIO, Tuple
+
+from supply_stacks_classes import CrateRope, IntCache
+
+_NUM_CRATES = IntCache()  # '3' -> 3
+_STACK_INDICES = IntCache(-1)  # Stack numbers start at 1, '3' -> 2
 
 
 def _get_top_crates(stacks: list) -> str:
 	"""
 	Gets the name of the crate on the top of each stack and concatinates them into a string
 
-	:param list stacks: Stacks to be parsed
+	:param list stacks: Stacks (bytearray or CrateRope objects) to be parsed
 	:return str: String representing the top crate in each stack
 	"""
 	retval = ""
-	for stack in stacks:
-		retval += stack[-1]
+	for position, stack in enumerate(stacks):
+		if not len(stack):
+			raise _empty_stack_error(position)
+		retval += chr(stack[-1])
 	return retval
 
 
-def _do_moves(stacks: list, moves: list) -> Tuple[list, list]:
+def _empty_stack_error(position: int) -> ValueError:
 	"""
-	Modifies the given stack according to the list of moves.
+	Builds the error raised when a stack ends up empty and therefore has no top crate
 
-	A = Challenge 1 output
-	B = Challenge 2 output
+	:param int position: Index of the empty stack
+	:return ValueError: Error naming the empty stack
+	"""
+	return ValueError(f"Stack {position + 1} has no crates left on top. Please verify inputs.")
 
-	:param list stacks: List of stacks to be modified
-	:param list moves: List of actions to be taken on the stack
-	:return Tuple[list,list]: (A, B)
+
+def _clone_stacks(stacks: List[bytearray]) -> List[bytearray]:
 	"""
+	Copies the given stacks so that they can be modified independently. Each stack is a flat
+	bytearray of crate names (bottom to top), so cloning it is a single buffer copy rather than
+	a deepcopy walking every crate.
 
-	c1_stack = copy.deepcopy(stacks)
-	c2_stack = copy.deepcopy(stacks)
+	:param List[bytearray] stacks: Stacks to be copied
+	:return List[bytearray]: Independent copy of the stacks
+	"""
+	return [bytearray(stack) for stack in stacks]
 
-	def do_move_ordering_preserved(stacks: list, move: Tuple[int, int, int]):
-		"""
-		Helper function which does a single move on the stack. Stack ordering preserved during
-		the move.
 
-		:param list stacks: List of stacks to be modified
-		:param Tuple[int, int, int] move: Tuple representing the move to be made
-		"""
-		num_crates, move_from, move_to = move
-		buffer = [stacks[move_from].pop() for _ in range(num_crates)]
-		buffer_size = len(buffer)
+def _move_crates_ordering_preserved(stacks: List[bytearray], move: Tuple[int, int, int]):
+	"""
+	Does a single move on the stacks one crate at a time. Stack ordering preserved during
+	the move.
 
-		for _ in range(buffer_size):
-			stacks[move_to].append(buffer.pop())
+	:param List[bytearray] stacks: List of stacks to be modified
+	:param Tuple[int, int, int] move: Tuple representing the move to be made
+	"""
+	num_crates, move_from, move_to = move
+	buffer = [stacks[move_from].pop() for _ in range(num_crates)]
+	buffer_size = len(buffer)
 
-	def do_move_ordering_changed(stacks: list, move: Tuple[int, int, int]):
-		"""
-		Helper function which does a single move on the stack. Stack ordering not preserved
-		during the move.
+	for _ in range(buffer_size):
+		stacks[move_to].append(buffer.pop())
 
-		:param list stacks: List of stacks to be modified
-		:param Tuple[int, int, int] move: Tuple representing the move to be made
-		"""
-		num_crates, move_from, move_to = move
-		buffer = [stacks[move_from].pop() for _ in range(num_crates)]
-		stacks[move_to].extend(buffer)
+
+def _move_crates_ordering_changed(stacks: List[bytearray], move: Tuple[int, int, int]):
+	"""
+	Does a single move on the stacks one crate at a time. Stack ordering not preserved during
+	the move.
+
+	:param List[bytearray] stacks: List of stacks to be modified
+	:param Tuple[int, int, int] move: Tuple representing the move to be made
+	"""
+	num_crates, move_from, move_to = move
+	buffer = [stacks[move_from].pop() for _ in range(num_crates)]
+	stacks[move_to].extend(buffer)
+
+
+def _take_top_crates(stack: bytearray, num_crates: int) -> bytearray:
+	"""
+	Removes the top num_crates crates from a stack with a single slice and delete
+
+	:param bytearray stack: Stack to remove the crates from
+	:param int num_crates: Number of crates to remove
+	:return bytearray: Removed crates (bottom to top)
+	"""
+	if num_crates > len(stack):
+		raise ValueError(
+			f"Cannot move {num_crates} crates from a stack of {len(stack)} crates."
+			" Please verify inputs."
+		)
+
+	split = len(stack) - num_crates
+	crates = stack[split:]
+	del stack[split:]
+
+	return crates
+
+
+def _move_slice_ordering_preserved(stacks: List[bytearray], move: Tuple[int, int, int]):
+	"""
+	Does a single move on the stacks as one bulk slice transfer. Stack ordering preserved
+	during the move.
+
+	:param List[bytearray] stacks: List of stacks to be modified
+	:param Tuple[int, int, int] move: Tuple representing the move to be made
+	"""
+	num_crates, move_from, move_to = move
+	stacks[move_to] += _take_top_crates(stacks[move_from], num_crates)
+
+
+def _move_slice_ordering_changed(stacks: List[bytearray], move: Tuple[int, int, int]):
+	"""
+	Does a single move on the stacks as one bulk slice transfer. Stack ordering not preserved
+	during the move.
+
+	:param List[bytearray] stacks: List of stacks to be modified
+	:param Tuple[int, int, int] move: Tuple representing the move to be made
+	"""
+	num_crates, move_from, move_to = move
+	crates = _take_top_crates(stacks[move_from], num_crates)
+	crates.reverse()
+	stacks[move_to] += crates
+
+
+def _build_ropes(stacks: List[bytearray]) -> List[CrateRope]:
+	"""
+	Copies the given stacks into CrateRope objects
+
+	:param List[bytearray] stacks: Stacks to be copied
+	:return List[CrateRope]: Independent copy of the stacks
+	"""
+	return [CrateRope(stack) for stack in stacks]
+
+
+def _move_rope_ordering_preserved(stacks: List[CrateRope], move: Tuple[int, int, int]):
+	"""
+	Does a single move on the stacks by splitting off and relinking the moved crates in
+	O(log n). Stack ordering preserved during the move.
+
+	:param List[CrateRope] stacks: List of stacks to be modified
+	:param Tuple[int, int, int] move: Tuple representing the move to be made
+	"""
+	num_crates, move_from, move_to = move
+	stacks[move_to].put(stacks[move_from].take_top(num_crates))
+
+
+def _move_rope_ordering_changed(stacks: List[CrateRope], move: Tuple[int, int, int]):
+	"""
+	Does a single move on the stacks by splitting off and relinking the moved crates in
+	O(log n), with their reversal applied lazily. Stack ordering not preserved during the move.
+
+	:param List[CrateRope] stacks: List of stacks to be modified
+	:param Tuple[int, int, int] move: Tuple representing the move to be made
+	"""
+	num_crates, move_from, move_to = move
+	stacks[move_to].put(stacks[move_from].take_top(num_crates), reverse=True)
+
+
+# (copy stacks, ordering changed move, ordering preserved move) for each simulation engine
+_ENGINES = {
+	"crates": (_clone_stacks, _move_crates_ordering_changed, _move_crates_ordering_preserved),
+	"rope": (_build_ropes, _move_rope_ordering_changed, _move_rope_ordering_preserved),
+	"slices": (_clone_stacks, _move_slice_ordering_changed, _move_slice_ordering_preserved),
+}
+
+
+def _do_moves(
+	stacks: List[bytearray], moves: Iterable[Tuple[int, int, int]], engine: str = "slices"
+) -> Tuple[list, list]:
+	"""
+	Applies the list of moves to two independent copies of the given stacks.
+
+	A = Challenge 1 output
+	B = Challenge 2 output
+
+	:param List[bytearray] stacks: List of stacks to be modified
+	:param Iterable[Tuple[int, int, int]] moves: Actions to be taken on the stack, in order
+	:param str engine: Name of the simulation engine to use (see _ENGINES), defaults to "slices"
+	:return Tuple[list, list]: (A, B)
+	"""
+	copy_stacks, do_move_ordering_changed, do_move_ordering_preserved = _ENGINES[engine]
+
+	c1_stack = copy_stacks(stacks)
+	c2_stack = copy_stacks(stacks)
 
 	for move in moves:
 		do_move_ordering_changed(c1_stack, move)
@@ -136,75 +259,183 @@ def _do_moves(stacks: list, moves: list) -> Tuple[list, list]:
 	return c1_stack, c2_stack
 
 
-def _parse_file(file: str) -> Tuple[list, list]:
+def _trace_top_crates(stacks: List[bytearray], moves: list) -> Tuple[str, str]:
 	"""
-	Parses the input file into a the starting configuration and the list of moves
-	to be taken. Returns two lists:
+	Finds the top crate of each stack after all of the moves without simulating them. Each
+	final top position is traced backwards through the list of moves to the position it held
+	in the starting configuration, costing O(stacks * moves) and never modifying a stack.
 
-	A = List of list objects which represent each stack of crates
-	B = List of tuples representing the move (# to move, stack to move from, stack to move to)
+	While tracing, a position is a (stack, depth from the top) pair. Undoing a move which
+	placed the position among the num_crates crates on top of the destination sends it back
+	to the source stack (mirrored within those crates if the move reversed their order),
+	otherwise the depth only shifts by num_crates if the move touched its stack.
 
-	:param str file: File with the starter configuration and moves
-	:return Tuple[list, list]: (A, B)
+	A = Top crates with the move ordering changed (Challenge 1 output)
+	B = Top crates with the move ordering preserved (Challenge 2 output)
+
+	:param List[bytearray] stacks: Starting configuration of the stacks
+	:param list moves: List of actions to be taken on the stack
+	:return Tuple[str, str]: (A, B)
 	"""
-	def parse_move(line: str) -> Tuple[int, int, int]:
-		"""
-		Helper function to parse the move statements. The syntax for a move is as follows:
-		- `move A from B to C`
-		- A = # to move
-		- B = stack to move from
-		- C = stack to move to
-
-		:param str line: move statement to be parsed
-		:return Tuple[int, int, int]: parsed move statement assembled as a tuple
-		"""
-		parts = line.split()
-		return (int(parts[1]), int(parts[3]) - 1, int(parts[5]) - 1)
+	heights = [len(stack) for stack in stacks]
+
+	for num_crates, move_from, move_to in moves:
+		if num_crates > heights[move_from]:
+			raise ValueError(
+				f"Cannot move {num_crates} crates from a stack of {heights[move_from]} crates."
+				" Please verify inputs."
+			)
+
+		heights[move_from] -= num_crates
+		heights[move_to] += num_crates
 
-	def parse_stacks(stack_buffer: list) -> List[list]:
+	def trace(stack: int, ordering_changed: bool) -> int:
 		"""
-		Helper function to parse through the configuration representing the initial configuration
-		of the stacks.
+		Helper function which traces the top of a final stack back to its starting crate.
 
-		:param list stack_buffer: List of strings representing the stack configuration
-		:return List[list]: List of lists, one for each crate stack
+		:param int stack: Index of the stack whose top crate is traced
+		:param bool ordering_changed: Whether moves reverse the ordering of the crates
+		:return int: Name of the crate
 		"""
-		crate_name_pos = list()
-		stack_buffer = list(reversed(stack_buffer))
+		depth = 0
+
+		for num_crates, move_from, move_to in reversed(moves):
+			if stack == move_to and depth < num_crates:
+				stack = move_from
+				depth = num_crates - 1 - depth if ordering_changed else depth
+			else:
+				if stack == move_to:
+					depth -= num_crates
+				if stack == move_from:
+					depth += num_crates
+
+		return stacks[stack][-1 - depth]
+
+	top_crates_ordering_changed = ""
+	top_crates_ordering_preserved = ""
 
-		stacks = list()
+	for stack, height in enumerate(heights):
+		if not height:
+			raise _empty_stack_error(stack)
 
-		for pos, val in enumerate(stack_buffer[0]):
-			if val.isnumeric():
-				crate_name_pos.append(pos)
-				stacks.append(list())
+		top_crates_ordering_changed += chr(trace(stack, True))
+		top_crates_ordering_preserved += chr(trace(stack, False))
 
-		for line in stack_buffer[1:]:
-			for pos, val in enumerate(crate_name_pos):
-				if line[val] != " ":
-					stacks[pos].append(line[val])
+	return top_crates_ordering_changed, top_crates_ordering_preserved
 
-		return stacks
+
+def _parse_move(line: str) -> Tuple[int, int, int]:
+	"""
+	Parses a move statement. The syntax for a move is as follows:
+	- `move A from B to C`
+	- A = # to move
+	- B = stack to move from
+	- C = stack to move to
+
+	The numbers are converted through caches rather than int(), since the same few crate counts
+	and stack numbers appear on every line (about 1.5x faster, see benchmark_supply_stacks.py
+	--parser).
+
+	:param str line: move statement to be parsed
+	:return Tuple[int, int, int]: parsed move statement assembled as a tuple
+	"""
+	_, num_crates, _, move_from, _, move_to = line.split()
+	return _NUM_CRATES[num_crates], _STACK_INDICES[move_from], _STACK_INDICES[move_to]
+
+
+def _parse_stacks(stack_buffer: list) -> List[bytearray]:
+	"""
+	Parses through the configuration representing the initial configuration of the stacks.
+
+	:param list stack_buffer: List of strings representing the stack configuration
+	:return List[bytearray]: List of crate names (bottom to top), one for each crate stack
+	"""
+	crate_name_pos = list()
+	stack_buffer = list(reversed(stack_buffer))
 
 	stacks = list()
-	moves = list()
 
+	for pos, val in enumerate(stack_buffer[0]):
+		if val.isnumeric():
+			crate_name_pos.append(pos)
+			stacks.append(bytearray())
+
+	for line in stack_buffer[1:]:
+		for pos, val in enumerate(crate_name_pos):
+			if val < len(line) and line[val] != " ":
+				stacks[pos].append(ord(line[val]))
+
+	return stacks
+
+
+def _read_stacks(fptr: TextIO) -> List[bytearray]:
+	"""
+	Reads the starting configuration from the top of an open input file. Reading stops right
+	after the line numbering the stacks, so the stream is left at the start of the moves.
+
+	:param TextIO fptr: Open input file
+	:return List[bytearray]: List of crate names (bottom to top), one for each crate stack
+	"""
 	stacks_buffer = list()
 
-	with open(file, "r") as fptr:
-		for line in fptr:
-			line = line.strip('\n\r')
-			if line.startswith("move"):
-				moves.append(parse_move(line))
-			else:
-				if line:
-					stacks_buffer.append(line)
+	for line in fptr:
+		line = line.strip('\n\r')
+
+		if line:
+			stacks_buffer.append(line)
+
+		if line.strip()[:1].isnumeric() or (not line and stacks_buffer):
+			break
+
+	return _parse_stacks(stacks_buffer)
+
+
+def _iter_moves(fptr: TextIO) -> Iterator[Tuple[int, int, int]]:
+	"""
+	Lazily parses the moves from an open input file, one line at a time
+
+	:param TextIO fptr: Open input file, positioned after the starting configuration
+	:return Iterator[Tuple[int, int, int]]: Iterator over the moves
+	"""
+	for line in fptr:
+		if line.startswith("move"):
+			yield _parse_move(line)
 
-	stacks = parse_stacks(stacks_buffer)
+
+def _parse_file(file: str) -> Tuple[list, list]:
+	"""
+	Parses the input file into a the starting configuration and the list of moves
+	to be taken. Returns two lists:
+
+	A = List of bytearray objects which represent each stack of crates
+	B = List of tuples representing the move (# to move, stack to move from, stack to move to)
+
+	:param str file: File with the starter configuration and moves
+	:return Tuple[list, list]: (A, B)
+	"""
+	with open(file, "r") as fptr:
+		stacks = _read_stacks(fptr)
+		moves = list(_iter_moves(fptr))
 
 	return stacks, moves
 
 
+def _do_moves_streaming(file: str, engine: str = "slices") -> Tuple[list, list]:
+	"""
+	Parses the starting configuration of the input file and then applies each move to both
+	simulations as soon as it is read, so the list of moves is never held in memory.
+
+	A = Challenge 1 output
+	B = Challenge 2 output
+
+	:param str file: File with the starter configuration and moves
+	:param str engine: Name of the simulation engine to use (see _ENGINES), defaults to "slices"
+	:return Tuple[list, list]: (A, B)
+	"""
+	with open(file, "r") as fptr:
+		return _do_moves(_read_stacks(fptr), _iter_moves(fptr), engine)
+
+
 def _validate_arguments(args: argparse.Namespace):
 	"""
 	This function will validate the arguments provided and raise the proper errors
@@ -212,6 +443,9 @@ def _validate_arguments(args: argparse.Namespace):
 	if not os.path.exists(args.infile):
 		raise ValueError(f"The provided file does not exist: {args.infile}")
 
+	if args.stream and args.engine == "trace":
+		raise ValueError("The 'trace' engine needs every move up front and can not be streamed")
+
 
 def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 	"""
@@ -227,6 +461,21 @@ def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 		help="Path to the input file"
 	)
 
+	parser.add_argument(
+		"--engine", dest='engine', type=str, required=False, default="slices",
+		choices=sorted([*_ENGINES, "trace"]),
+		help=(
+			"Simulation engine: 'crates' moves one crate at a time, 'slices' moves them in bulk,"
+			" 'rope' relinks them in a balanced tree, 'trace' traces each top crate back through"
+			" the moves without simulating them"
+		)
+	)
+
+	parser.add_argument(
+		"--stream", dest='stream', action="store_true",
+		help="Apply each move as soon as it is read instead of parsing every move first"
+	)
+
 	args = parser.parse_args() if cmd_args is None else parser.parse_args(cmd_args)
 	_validate_arguments(args)
 
@@ -247,8 +496,17 @@ def main(cmd_args: list = None) -> Tuple[str, str]:
 	:return tuple[int,int]: (A, B)
 	"""
 	args = _get_arguments(cmd_args)
+
+	if args.stream:
+		c1_stack, c2_stack = _do_moves_streaming(args.infile, args.engine)
+		return _get_top_crates(c1_stack), _get_top_crates(c2_stack)
+
 	stacks, moves = _parse_file(args.infile)
-	c1_stack, c2_stack = _do_moves(stacks, moves)
+
+	if args.engine == "trace":
+		return _trace_top_crates(stacks, moves)
+
+	c1_stack, c2_stack = _do_moves(stacks, moves, args.engine)
 
 	return _get_top_crates(c1_stack), _get_top_crates(c2_stack)
 
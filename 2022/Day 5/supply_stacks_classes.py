@@ -0,0 +1,248 @@
+"""
+This file will contain the classes used in the supply_stacks.py script
+"""
+from __future__ import annotations
+
+import random
+
+from typing import Iterator, Optional, Tuple
+
+
+class IntCache(dict):
+	"""
+	IntCache: Maps the text of a number to its value (plus a fixed offset), converting each
+	distinct text only once. Move statements repeat the same few crate counts and stack numbers,
+	so a dictionary lookup replaces most calls to int().
+	"""
+
+	def __init__(self, offset: int = 0):
+		"""
+		Constructor for the IntCache class
+
+		:param int offset: Amount added to every converted value, defaults to 0
+		"""
+		super().__init__()
+		self.offset: int = offset
+
+	def __missing__(self, text: str) -> int:
+		value = self[text] = int(text) + self.offset
+		return value
+
+
+class _RopeNode:
+	"""
+	_RopeNode: Represents a single crate in a CrateRope along with the subtree below it
+	"""
+	__slots__ = ("crate", "size", "left", "right", "reversed")
+
+	def __init__(self, crate: int):
+		"""
+		Constructor for the _RopeNode class
+
+		:param int crate: Name of the crate
+		"""
+		self.crate: int = crate
+		self.size: int = 1
+		self.left: Optional[_RopeNode] = None
+		self.right: Optional[_RopeNode] = None
+		self.reversed: bool = False  # Children (and their subtrees) still need to be swapped
+
+	def push(self):
+		"""
+		Applies a pending reversal to this node and hands it down to its children
+		"""
+		if self.reversed:
+			self.left, self.right = self.right, self.left
+			if self.left is not None:
+				self.left.reversed = not self.left.reversed
+			if self.right is not None:
+				self.right.reversed = not self.right.reversed
+			self.reversed = False
+
+	def update(self):
+		"""
+		Recomputes the size of the subtree after its children changed
+		"""
+		self.size = 1 + _size(self.left) + _size(self.right)
+
+
+def _size(node: Optional[_RopeNode]) -> int:
+	"""
+	Returns the number of crates below a node (0 for an empty subtree)
+
+	:param Optional[_RopeNode] node: Node to be measured
+	:return int: Size of the subtree
+	"""
+	return node.size if node is not None else 0
+
+
+def _build(crates: bytes, start: int, end: int) -> Optional[_RopeNode]:
+	"""
+	Builds a perfectly balanced subtree from a range of crates
+
+	:param bytes crates: Crate names (bottom to top)
+	:param int start: Index of the first crate in the subtree
+	:param int end: Index after the last crate in the subtree
+	:return Optional[_RopeNode]: Root of the subtree, None if the range is empty
+	"""
+	if start >= end:
+		return None
+
+	middle = (start + end) // 2
+	node = _RopeNode(crates[middle])
+	node.left = _build(crates, start, middle)
+	node.right = _build(crates, middle + 1, end)
+	node.update()
+
+	return node
+
+
+def _split(
+	node: Optional[_RopeNode], count: int
+) -> Tuple[Optional[_RopeNode], Optional[_RopeNode]]:
+	"""
+	Splits a subtree into its first count crates and the remaining crates in O(log n)
+
+	:param Optional[_RopeNode] node: Subtree to be split
+	:param int count: Number of crates in the first part
+	:return Tuple[Optional[_RopeNode], Optional[_RopeNode]]: (first part, remaining part)
+	"""
+	if node is None:
+		return None, None
+
+	node.push()
+
+	if _size(node.left) >= count:
+		first, node.left = _split(node.left, count)
+		node.update()
+		return first, node
+
+	node.right, rest = _split(node.right, count - _size(node.left) - 1)
+	node.update()
+	return node, rest
+
+
+def _merge(first: Optional[_RopeNode], second: Optional[_RopeNode]) -> Optional[_RopeNode]:
+	"""
+	Concatenates two subtrees in O(log n). The root is picked at random, weighted by the size
+	of each subtree, which keeps the tree balanced in expectation without storing priorities.
+
+	:param Optional[_RopeNode] first: Subtree holding the lower crates
+	:param Optional[_RopeNode] second: Subtree holding the upper crates
+	:return Optional[_RopeNode]: Root of the concatenated subtree
+	"""
+	if first is None:
+		return second
+	if second is None:
+		return first
+
+	if random.random() * (first.size + second.size) < first.size:
+		first.push()
+		first.right = _merge(first.right, second)
+		first.update()
+		return first
+
+	second.push()
+	second.left = _merge(first, second.left)
+	second.update()
+	return second
+
+
+class CrateRope:
+	"""
+	CrateRope: Represents a stack of crates as a balanced tree, so that the top crates of a stack
+	can be split off and relinked onto another stack in O(log n) no matter how many crates move.
+	Reversing the order of the moved crates only flips a flag which is applied lazily.
+	"""
+	__slots__ = ("_root",)
+
+	def __init__(self, crates: bytes = b""):
+		"""
+		Constructor for the CrateRope class
+
+		:param bytes crates: Crate names (bottom to top)
+		"""
+		self._root: Optional[_RopeNode] = _build(crates, 0, len(crates))
+
+	def __len__(self) -> int:
+		return _size(self._root)
+
+	def __getitem__(self, index: int) -> int:
+		"""
+		Returns the name of the crate at a given position (negative positions count from the top)
+
+		:param int index: Position of the crate
+		:return int: Name of the crate
+		"""
+		size = len(self)
+		index = index + size if index < 0 else index
+
+		if not 0 <= index < size:
+			raise IndexError("CrateRope index out of range")
+
+		node = self._root
+
+		while True:
+			node.push()
+			left_size = _size(node.left)
+
+			if index < left_size:
+				node = node.left
+			elif index == left_size:
+				return node.crate
+			else:
+				index -= left_size + 1
+				node = node.right
+
+	def __iter__(self) -> Iterator[int]:
+		"""
+		Iterates over the crate names from the bottom of the stack to the top
+
+		:return Iterator[int]: Iterator over the crate names
+		"""
+		pending = list()
+		node = self._root
+
+		while pending or node is not None:
+			while node is not None:
+				node.push()
+				pending.append(node)
+				node = node.left
+
+			node = pending.pop()
+			yield node.crate
+			node = node.right
+
+	def __bytes__(self) -> bytes:
+		return bytes(iter(self))
+
+	def take_top(self, num_crates: int) -> CrateRope:
+		"""
+		Removes the top num_crates crates of the stack
+
+		:param int num_crates: Number of crates to remove
+		:return CrateRope: Removed crates (bottom to top)
+		"""
+		if num_crates > len(self):
+			raise ValueError(
+				f"Cannot move {num_crates} crates from a stack of {len(self)} crates."
+				" Please verify inputs."
+			)
+
+		crates = CrateRope()
+		self._root, crates._root = _split(self._root, len(self) - num_crates)
+
+		return crates
+
+	def put(self, crates: CrateRope, reverse: bool = False):
+		"""
+		Places crates on the top of the stack. The provided rope is emptied.
+
+		:param CrateRope crates: Crates to be placed (bottom to top)
+		:param bool reverse: Whether to place the crates in the opposite order, defaults to False
+		"""
+		if reverse and crates._root is not None:
+			crates._root.reversed = not crates._root.reversed
+
+		self._root = _merge(self._root, crates._root)
+		crates._root = None
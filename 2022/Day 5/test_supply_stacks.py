@@ -5,10 +5,13 @@ Author: Ryan Lanciloti
 Date of Creation: 12/6/2022
 """
 import os
+import random
 from typing import List
 
 import pytest
-from supply_stacks import main
+from supply_stacks import (
+	main, _do_moves, _get_top_crates, _parse_file, _parse_move, _trace_top_crates
+)
 
 _CUR_DIR_PATH = os.path.dirname(__file__)
 
@@ -46,15 +49,130 @@ def _build_test_suite() -> List[tuple]:
 	return list(zip(input_files, output_files))
 
 
+@pytest.mark.parametrize("engine", ["crates", "rope", "slices", "trace"])
 @pytest.mark.parametrize("infile, outfile", _build_test_suite())
-def test_inputs(infile, outfile):
+def test_inputs(infile, outfile, engine):
 	"""
 	This function will verify that the expected input matches the expected output
 	"""
 	with open(outfile, "r") as fptr:
 		expected_output = fptr.read()
 
-	actual_output = main(['--infile', infile])
+	actual_output = main(['--infile', infile, '--engine', engine])
 
 	assert expected_output == str(actual_output), \
 		f"Expected: {expected_output} does not match actual: {str(actual_output)}"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_trace_matches_simulation(seed):
+	"""
+	This function will verify that tracing the top crates backwards agrees with simulating the
+	moves on the test inputs and on randomly generated crate yards
+	"""
+	rng = random.Random(seed)
+	crate_yards = [_parse_file(infile) for infile, _ in _build_test_suite()]
+
+	stacks = [bytearray(rng.choices(b"ABCDEFGHIJ", k=rng.randint(0, 12))) for _ in range(5)]
+	heights = [len(stack) for stack in stacks]
+	moves = list()
+
+	for _ in range(rng.randint(0, 40)):
+		move_from, move_to = rng.randrange(5), rng.randrange(5)
+		num_crates = rng.randint(0, heights[move_from])
+		heights[move_from] -= num_crates
+		heights[move_to] += num_crates
+		moves.append((num_crates, move_from, move_to))
+
+	crate_yards.append((stacks, moves))
+
+	for stacks, moves in crate_yards:
+		c1_stack, c2_stack = _do_moves(stacks, moves)
+
+		if not all(c1_stack):
+			empty_stack = f"Stack {c1_stack.index(bytearray()) + 1} "
+
+			with pytest.raises(ValueError, match=empty_stack):
+				_get_top_crates(c1_stack)
+			with pytest.raises(ValueError, match=empty_stack):
+				_trace_top_crates(stacks, moves)
+			continue
+
+		expected_output = (_get_top_crates(c1_stack), _get_top_crates(c2_stack))
+
+		assert expected_output == _trace_top_crates(stacks, moves)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rope_matches_slices(seed):
+	"""
+	This function will verify that the rope engine leaves every stack in the same state as the
+	slice engine on randomly generated crate yards
+	"""
+	rng = random.Random(seed)
+	stacks = [bytearray(rng.choices(b"ABCDEFGHIJ", k=rng.randint(0, 200))) for _ in range(4)]
+	heights = [len(stack) for stack in stacks]
+	moves = list()
+
+	for _ in range(rng.randint(0, 200)):
+		move_from, move_to = rng.randrange(4), rng.randrange(4)
+		num_crates = rng.randint(0, heights[move_from])
+		heights[move_from] -= num_crates
+		heights[move_to] += num_crates
+		moves.append((num_crates, move_from, move_to))
+
+	for expected_stacks, actual_stacks in zip(
+		_do_moves(stacks, moves, "slices"), _do_moves(stacks, moves, "rope")
+	):
+		assert expected_stacks == [bytearray(stack) for stack in actual_stacks]
+
+
+@pytest.mark.parametrize("engine", ["crates", "rope", "slices"])
+@pytest.mark.parametrize("infile, outfile", _build_test_suite())
+def test_streaming(infile, outfile, engine):
+	"""
+	This function will verify that applying the moves while they are read gives the same answer
+	"""
+	with open(outfile, "r") as fptr:
+		expected_output = fptr.read()
+
+	actual_output = main(['--infile', infile, '--engine', engine, '--stream'])
+
+	assert expected_output == str(actual_output), \
+		f"Expected: {expected_output} does not match actual: {str(actual_output)}"
+
+
+@pytest.mark.parametrize("engine", ["crates", "rope", "slices", "trace"])
+def test_empty_stack(tmp_path, engine):
+	"""
+	This function will verify that every engine reports the stack left without a top crate
+	"""
+	infile = tmp_path / "input.txt"
+	infile.write_text("    [D]    \n[N] [C]    \n[Z] [M] [P]\n 1   2   3 \n\nmove 1 from 3 to 1\n")
+
+	with pytest.raises(ValueError, match="Stack 3 "):
+		main(['--infile', str(infile), '--engine', engine])
+
+
+@pytest.mark.parametrize("line", [
+	"move 1 from 2 to 1", "move 1 from 2 to 1 ", "move  1 from 2 to 1\r\n", "\tmove 1 from 2 to 1"
+])
+def test_parse_move(line):
+	"""
+	This function will verify that extra whitespace around the words of a move is ignored
+	"""
+	actual_output = _parse_move(line)
+
+	assert (1, 1, 0) == actual_output, \
+		f"Expected: {(1, 1, 0)} does not match actual: {actual_output}"
+
+
+@pytest.mark.parametrize("line", [
+	"move x from 2 to 1", "move 1 from 2", "move 1 from 2 to 1 now"
+])
+def test_parse_invalid_move(line):
+	"""
+	This function will verify that malformed move statements are rejected
+	"""
+	with pytest.raises(ValueError):
+		_parse_move(line)
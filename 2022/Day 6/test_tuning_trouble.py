@@ -4,11 +4,16 @@ This file will contain the unit tests for the tuning trouble challenge
 Author: Ryan Lanciloti
 Date of Creation: 12/3/2022
 """
+import asyncio
+import io
 import os
 from typing import List
 
 import pytest
-from tuning_trouble import main
+from tuning_trouble import (
+	main, _find_marker_indices, _find_all_markers, _ALL_MARKER_ENGINES
+)
+from tuning_trouble_classes import MarkerDetector
 
 _CUR_DIR_PATH = os.path.dirname(__file__)
 
@@ -58,3 +63,113 @@ def test_inputs(infile, outfile):
 
 	assert expected_output == str(actual_output), \
 		f"Expected: {expected_output} does not match actual: {str(actual_output)}"
+
+
+@pytest.mark.parametrize("input_str, window_sizes, expected_output", [
+	("bvwbjplbgvbhsrlpgdmjqwftvncz", [4, 14], [5, 23]),
+	("nppdvjthqldpwncqszvftbrmjlhg", [4, 14], [6, 23]),
+	("zcfzfwzzqfrljwzlrfnpqdbhtmscgvjw", [14, 4], [26, 11]),
+	("abcd", [4, 5], [4, -1]),
+	("aaaa", [1, 2], [1, -1]),
+	("", [4], [-1]),
+])
+def test_marker_indices(input_str, window_sizes, expected_output):
+	"""
+	This function will verify the markers found for several window sizes in a single scan,
+	including a marker made up of the final characters of the signal
+	"""
+	actual_output = _find_marker_indices(input_str, window_sizes)
+
+	assert expected_output == actual_output, \
+		f"Expected: {expected_output} does not match actual: {actual_output}"
+
+
+def test_window_sizes(tmp_path):
+	"""
+	This function will verify that any number of window sizes can be requested from one scan
+	"""
+	infile = tmp_path / "input.txt"
+	infile.write_bytes(b"zcfzfwzzqfrljwzlrfnpqdbhtmscgvjw\r\n")
+
+	actual_output = main([
+		'--infile', str(infile), '--window', '14', '--window', '4', '--window', '50'
+	])
+
+	assert (26, 11, -1) == actual_output, \
+		f"Expected: {(26, 11, -1)} does not match actual: {actual_output}"
+
+
+@pytest.mark.parametrize("engine", sorted(_ALL_MARKER_ENGINES))
+@pytest.mark.parametrize("input_str, window_sizes, expected_output", [
+	("bvwbjplbgvbhsrlpgdmjqwftvncz", [4], [[5, 6, 7, 8, 9, 10, 12, 13, 14, 15, 16, 17, 18, 19, 20,
+		21, 22, 23, 24, 25, 26, 27, 28]]),
+	(b"aabcabcdd", [3, 4, 1, 5], [[4, 5, 6, 7, 8], [8], list(range(1, 10)), []]),
+	("abc", [4], [[]]),
+])
+def test_all_markers(input_str, window_sizes, expected_output, engine):
+	"""
+	This function will verify that every marker of the signal is found by each engine
+	"""
+	actual_output = _find_all_markers(input_str, window_sizes, engine)
+
+	assert expected_output == actual_output, \
+		f"Expected: {expected_output} does not match actual: {actual_output}"
+
+
+@pytest.mark.parametrize("engine", sorted(_ALL_MARKER_ENGINES))
+def test_all_markers_file(tmp_path, engine):
+	"""
+	This function will verify that every marker of a file is reported from the commandline
+	"""
+	infile = tmp_path / "input.txt"
+	infile.write_bytes(b"abcabcc\r\n")
+
+	actual_output = main(['--infile', str(infile), '--window', '3', '--all', '--engine', engine])
+
+	assert ([3, 4, 5, 6],) == actual_output, \
+		f"Expected: {([3, 4, 5, 6],)} does not match actual: {actual_output}"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64])
+@pytest.mark.parametrize("infile, outfile", _build_test_suite())
+def test_incremental_detector(infile, outfile, chunk_size, monkeypatch):
+	"""
+	This function will verify that markers spanning chunk boundaries are found when the signal
+	is fed in chunks, from a stream, an asyncio stream and stdin
+	"""
+	with open(outfile, "r") as fptr:
+		expected_output = fptr.read()
+
+	with open(infile, "rb") as fptr:
+		signal = fptr.read()
+
+	detector = MarkerDetector([4, 14])
+	for start in range(0, len(signal), chunk_size):
+		detector.feed(signal[start:start + chunk_size].rstrip(b"\n"))
+
+	assert expected_output == str(tuple(detector.markers))
+
+	detector = MarkerDetector([4, 14])
+	found = list(detector.iter_markers(io.BytesIO(signal + b"\r\nabcdefghijklmnop"), chunk_size))
+
+	assert expected_output == str(tuple(detector.markers))
+	assert found == sorted(found, key=lambda x: x[1])
+
+	async def read_async() -> List[int]:
+		"""
+		Feeds the signal to an asyncio stream and reads the markers back from it
+		"""
+		reader = asyncio.StreamReader()
+		reader.feed_data(signal)
+		reader.feed_eof()
+
+		detector = MarkerDetector([4, 14])
+		async for _ in detector.aiter_markers(reader, chunk_size):
+			pass
+
+		return detector.markers
+
+	assert expected_output == str(tuple(asyncio.run(read_async())))
+
+	monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(signal)))
+	assert expected_output == str(main(['--infile', '-']))
@@ -33,8 +33,183 @@ Date of Creation: 12/5/2022
 """
 import os
 import argparse
+import contextlib
+import mmap
+import sys
 
-from typing import Tuple
+from typing import BinaryIO, Iterator, List, Sequence, Tuple, Union
+
+from tuning_trouble_classes import MarkerDetector
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional, the 'numpy' engine falls back to pure Python
+	np = None
+
+_DEFAULT_WINDOW_SIZES = [4, 14]
+_BLOCK_SIZE = 1 << 20  # Window positions handled at a time by the 'numpy' engine
+
+
+def _find_marker_indices(
+	input_str: Union[str, bytes, memoryview], window_sizes: Sequence[int]
+) -> List[int]:
+	"""
+	Scans the input string once and determines, for every window size, the number of characters
+	that must be parsed before that many consecutive, unique characters are found. The scan
+	(see MarkerDetector) is O(n) regardless of the window sizes.
+
+	:param Union[str, bytes, memoryview] input_str: Signal to be scanned
+	:param Sequence[int] window_sizes: Number of consecutive unique characters for each marker
+	:return List[int]: Index of the last character of each marker (-1 if it never appears)
+	"""
+	detector = MarkerDetector(window_sizes)
+	detector.feed(input_str)
+
+	return detector.markers
+
+
+def _find_markers_in_stream(stream: BinaryIO, window_sizes: Sequence[int]) -> List[int]:
+	"""
+	Reads the signal from a binary stream (e.g. a pipe) in chunks, stopping as soon as the
+	markers of every window size have been found.
+
+	:param BinaryIO stream: Stream containing the signal
+	:param Sequence[int] window_sizes: Number of consecutive unique characters for each marker
+	:return List[int]: Index of the last character of each marker (-1 if it never appears)
+	"""
+	detector = MarkerDetector(window_sizes)
+
+	for _ in detector.iter_markers(stream):
+		pass
+
+	return detector.markers
+
+
+@contextlib.contextmanager
+def _open_signal(file: str) -> Iterator[memoryview]:
+	"""
+	Memory maps the input file and provides a view of the signal (its first line) without
+	copying it into a string
+
+	:param str file: File containing the signal
+	:return Iterator[memoryview]: Context manager providing a view of the signal
+	"""
+	if os.path.getsize(file) == 0:
+		yield memoryview(b"")
+		return
+
+	with open(file, "rb") as fptr, \
+		mmap.mmap(fptr.fileno(), 0, access=mmap.ACCESS_READ) as data:
+		end = data.find(b"\n")
+		end = len(data) if end == -1 else end
+		end = end - 1 if end and data[end - 1] == ord("\r") else end
+
+		with memoryview(data) as view, view[:end] as signal:
+			yield signal
+
+
+def _find_markers_in_file(file: str, window_sizes: Sequence[int]) -> List[int]:
+	"""
+	Memory maps the input file and scans the signal (its first line) a single time for the
+	markers of every window size, without copying the signal into a string.
+
+	:param str file: File containing the signal
+	:param Sequence[int] window_sizes: Number of consecutive unique characters for each marker
+	:return List[int]: Index of the last character of each marker (-1 if it never appears)
+	"""
+	with _open_signal(file) as signal:
+		return _find_marker_indices(signal, window_sizes)
+
+
+def _find_all_markers_by_bitmask(
+	input_str: Union[str, bytes, memoryview], window_size: int
+) -> List[int]:
+	"""
+	Determines every marker of the signal, i.e. every index where the preceding window_size
+	characters are all different. Each character is given its own bit and a rolling XOR of the
+	bits in the window is kept, toggling the bit of the character entering and of the character
+	leaving the window. A character appearing twice cancels out its own bit, so the window is
+	made up of unique characters exactly when window_size bits are set.
+
+	:param Union[str, bytes, memoryview] input_str: Signal to be scanned
+	:param int window_size: Number of consecutive unique characters making up a marker
+	:return List[int]: Index of the last character of every marker
+	"""
+	codes = [ord(char) for char in input_str] if isinstance(input_str, str) else input_str
+	markers = list()
+	mask = 0
+
+	for index, code in enumerate(codes):
+		mask ^= 1 << code
+		if index >= window_size:
+			mask ^= 1 << codes[index - window_size]
+
+		if mask.bit_count() == window_size:
+			markers.append(index + 1)
+
+	return markers
+
+
+def _find_all_markers_by_numpy(
+	input_str: Union[str, bytes, memoryview], window_size: int
+) -> List[int]:
+	"""
+	Determines every marker of the signal using NumPy. For each character appearing in a block
+	of the signal, a running count of its occurrences gives the number of times it appears in
+	every window at once, which yields the number of distinct characters of every window
+	position in a handful of vectorized passes. Falls back to the bitmask engine if NumPy is not
+	installed.
+
+	:param Union[str, bytes, memoryview] input_str: Signal to be scanned
+	:param int window_size: Number of consecutive unique characters making up a marker
+	:return List[int]: Index of the last character of every marker
+	"""
+	if np is None:
+		return _find_all_markers_by_bitmask(input_str, window_size)
+
+	if isinstance(input_str, str):
+		codes = np.fromiter(map(ord, input_str), dtype=np.uint32, count=len(input_str))
+	else:
+		codes = np.frombuffer(input_str, dtype=np.uint8)
+
+	markers = list()
+
+	# Blocks of window starts overlap by window_size - 1 characters to bound the memory used
+	for block_start in range(0, len(codes) - window_size + 1, _BLOCK_SIZE):
+		block = codes[block_start:block_start + _BLOCK_SIZE + window_size - 1]
+		distinct = np.zeros(len(block) - window_size + 1, dtype=np.int32)
+
+		for code in np.unique(block):
+			seen = np.concatenate(([0], np.cumsum(block == code, dtype=np.int32)))
+			distinct += seen[window_size:] > seen[:-window_size]
+
+		found = np.flatnonzero(distinct == window_size) + block_start + window_size
+		markers.extend(found.tolist())
+
+	return markers
+
+
+_ALL_MARKER_ENGINES = {
+	"bitmask": _find_all_markers_by_bitmask,
+	"numpy": _find_all_markers_by_numpy,
+}
+
+
+def _find_all_markers(
+	input_str: Union[str, bytes, memoryview], window_sizes: Sequence[int], engine: str = "bitmask"
+) -> List[List[int]]:
+	"""
+	Determines every marker of the signal for each window size, which shows how often the
+	signal locks across the entire capture rather than only where it first locks
+
+	:param Union[str, bytes, memoryview] input_str: Signal to be scanned
+	:param Sequence[int] window_sizes: Number of consecutive unique characters for each marker
+	:param str engine: Name of the engine in _ALL_MARKER_ENGINES, defaults to "bitmask"
+	:return List[List[int]]: Index of the last character of every marker, per window size
+	"""
+	find_all_markers = _ALL_MARKER_ENGINES[engine]
+
+	return [find_all_markers(input_str, window_size) for window_size in window_sizes]
 
 
 def _find_unique_string_index(file: str, num_unique_characters) -> int:
@@ -47,33 +222,20 @@ def _find_unique_string_index(file: str, num_unique_characters) -> int:
 	appear
 	:return int: Index of last consecutive character
 	"""
-	input_str = ""
-
-	with open(file, "r") as fptr:
-		input_str = fptr.readline()
-
-	for index in range(len(input_str) - num_unique_characters):
-		found = True
-		buffer = list(input_str[index:index + num_unique_characters])
-		buffer.sort()
-
-		for buffer_index in range(len(buffer) - 1):
-			if buffer[buffer_index] == buffer[buffer_index + 1]:
-				found = False
-
-		if found:
-			return index + num_unique_characters
-
-	return -1
+	return _find_markers_in_file(file, [num_unique_characters])[0]
 
 
 def _validate_arguments(args: argparse.Namespace):
 	"""
 	This function will validate the arguments provided and raise the proper errors
 	"""
-	if not os.path.exists(args.infile):
+	if args.infile != "-" and not os.path.exists(args.infile):
 		raise ValueError(f"The provided file does not exist: {args.infile}")
 
+	for window_size in args.window_sizes:
+		if window_size < 1:
+			raise ValueError(f"The window size must be at least 1: {window_size}")
+
 
 def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 	"""
@@ -86,23 +248,47 @@ def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 
 	parser.add_argument(
 		"--infile", dest='infile', type=str, required=True,
-		help="Path to the input file"
+		help="Path to the input file, '-' reads the signal from stdin"
+	)
+
+	parser.add_argument(
+		"--window", dest='window_sizes', type=int, required=False, action="append",
+		help=(
+			"Number of consecutive unique characters making up a marker, can be provided"
+			f" multiple times (defaults to {_DEFAULT_WINDOW_SIZES})"
+		)
+	)
+
+	parser.add_argument(
+		"--all", dest='all_markers', action="store_true",
+		help="Report every marker of the signal instead of only the first one"
+	)
+
+	parser.add_argument(
+		"--engine", dest='engine', type=str, required=False, default="bitmask",
+		choices=sorted(_ALL_MARKER_ENGINES),
+		help="Engine used to find every marker when '--all' is provided"
 	)
 
 	args = parser.parse_args() if cmd_args is None else parser.parse_args(cmd_args)
+	args.window_sizes = args.window_sizes or list(_DEFAULT_WINDOW_SIZES)
 	_validate_arguments(args)
 
 	return args
 
 
-def main(cmd_args: list = None) -> Tuple[int, int]:
+def main(cmd_args: list = None) -> Tuple[int, ...]:
 	"""
 	Main function which will act as an entry point for this script. Returns a tuple
 	containing two values: (A, B)
 
-	A = Number of characters that need to be processed before the first unique string
-	is found.
-	B = 0
+	A = Number of characters that need to be processed before the first 4 unique characters
+	are found.
+	B = Number of characters that need to be processed before the first 14 unique characters
+	are found.
+
+	When window sizes are provided, the tuple instead holds one such value per window size.
+	When '--all' is provided, each value is instead the list of every marker of the signal.
 
 	Example provided in the file header
 
@@ -111,14 +297,32 @@ def main(cmd_args: list = None) -> Tuple[int, int]:
 	"""
 	# pylint: disable=redefined-outer-name
 	args = _get_arguments(cmd_args)
-	tx_start = _find_unique_string_index(args.infile, 4)
-	tx_msg = _find_unique_string_index(args.infile, 14)
 
-	return tx_start, tx_msg
+	if args.all_markers and args.infile == "-":
+		signal = sys.stdin.buffer.readline().rstrip(b"\r\n")
+		return tuple(_find_all_markers(signal, args.window_sizes, args.engine))
 
+	if args.all_markers:
+		with _open_signal(args.infile) as signal:
+			return tuple(_find_all_markers(signal, args.window_sizes, args.engine))
 
-if __name__ == '__main__':
-	tx_start, tx_msg = main()
+	if args.infile == "-":
+		return tuple(_find_markers_in_stream(sys.stdin.buffer, args.window_sizes))
+
+	return tuple(_find_markers_in_file(args.infile, args.window_sizes))
 
-	print(f"Transmit start final character index: {tx_start}")
-	print(f"Transmit message final character index: {tx_msg}")
+
+if __name__ == '__main__':
+	markers = main()
+
+	if markers and isinstance(markers[0], list):
+		for marker_list in markers:
+			print(f"Marker final character indices ({len(marker_list)}): {marker_list}")
+	elif len(markers) == 2:
+		tx_start, tx_msg = markers
+
+		print(f"Transmit start final character index: {tx_start}")
+		print(f"Transmit message final character index: {tx_msg}")
+	else:
+		for marker in markers:
+			print(f"Marker final character index: {marker}")
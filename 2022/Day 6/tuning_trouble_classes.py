@@ -0,0 +1,156 @@
+"""
+This file will contain the classes used in the tuning_trouble.py script
+"""
+import asyncio
+
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, List, Sequence, Tuple, Union
+
+_CHUNK_SIZE = 1 << 16  # Bytes read from a stream at a time
+
+
+class MarkerDetector:
+	"""
+	MarkerDetector: Finds the markers of several window sizes in a datastream which is fed in
+	chunks. A marker is the number of characters that must be parsed before the given number of
+	consecutive, unique characters are found.
+
+	The detector keeps the index each character was last seen at along with the start of the
+	current run of unique characters. When a character repeats, the run jumps past its previous
+	occurrence, so the length of the run ending at each character is known in O(1). This state
+	carries over from one chunk to the next, so markers spanning chunk boundaries are found.
+	"""
+
+	def __init__(self, window_sizes: Sequence[int]):
+		"""
+		Constructor for the MarkerDetector class
+
+		:param Sequence[int] window_sizes: Number of consecutive unique characters for each marker
+		"""
+		self._window_sizes: List[int] = list(window_sizes)
+		self._remaining: List[int] = sorted(set(window_sizes), reverse=True)
+		self._markers: Dict[int, int] = dict()
+		self._last_seen: Dict[Union[str, int], int] = dict()
+		self._run_start: int = 0
+		self._position: int = 0
+		self._carry: bytes = b""  # '\r' held back in case the next chunk starts with '\n'
+
+	@property
+	def done(self) -> bool:
+		"""
+		Returns whether the marker of every window size has been found
+
+		:return bool: True once there is nothing left to look for
+		"""
+		return not self._remaining
+
+	@property
+	def markers(self) -> List[int]:
+		"""
+		Returns the marker of each window size, in the order the window sizes were provided
+
+		:return List[int]: Index of the last character of each marker (-1 if not found yet)
+		"""
+		return [self._markers.get(window_size, -1) for window_size in self._window_sizes]
+
+	def feed(self, chunk: Union[str, bytes, memoryview]) -> List[Tuple[int, int]]:
+		"""
+		Processes the next chunk of the datastream. Characters fed after every marker has been
+		found are ignored.
+
+		:param Union[str, bytes, memoryview] chunk: Next characters of the datastream
+		:return List[Tuple[int, int]]: (window size, marker) of every marker found in the chunk
+		"""
+		found = list()
+
+		if self.done:
+			return found
+
+		last_seen = self._last_seen
+		remaining = self._remaining
+		run_start = self._run_start
+		index = self._position - 1
+
+		for index, char in enumerate(chunk, self._position):
+			previous = last_seen.get(char, -1)
+			if previous >= run_start:
+				run_start = previous + 1
+			last_seen[char] = index
+
+			while remaining and index - run_start + 1 >= remaining[-1]:
+				window_size = remaining.pop()
+				self._markers[window_size] = index + 1
+				found.append((window_size, index + 1))
+
+			if not remaining:
+				break
+
+		self._run_start = run_start
+		self._position = index + 1
+
+		return found
+
+	def _take_line(self, chunk: bytes) -> Tuple[bytes, bool]:
+		"""
+		Cuts a chunk read from a stream at the line ending of the datastream (if it has one)
+
+		:param bytes chunk: Chunk read from a stream
+		:return Tuple[bytes, bool]: (characters of the datastream, whether the line ended)
+		"""
+		chunk = self._carry + chunk
+		end = chunk.find(b"\n")
+
+		if end != -1:
+			self._carry = b""
+			return chunk[:end].removesuffix(b"\r"), True
+
+		self._carry = b"\r" if chunk.endswith(b"\r") else b""
+		return chunk[:len(chunk) - len(self._carry)], False
+
+	def iter_markers(
+		self, stream: BinaryIO, chunk_size: int = _CHUNK_SIZE
+	) -> Iterator[Tuple[int, int]]:
+		"""
+		Reads a binary stream (file, pipe, socket file) chunk by chunk and yields each marker
+		as soon as it is found. Reading stops once every marker has been found or once the line
+		holding the datastream ends.
+
+		:param BinaryIO stream: Stream to be read
+		:param int chunk_size: Maximum number of bytes read at a time, defaults to _CHUNK_SIZE
+		:return Iterator[Tuple[int, int]]: Iterator over the (window size, marker) found
+		"""
+		read = getattr(stream, "read1", stream.read)  # read1 returns whatever is available
+
+		while not self.done:
+			chunk = read(chunk_size)
+			if not chunk:
+				break
+
+			signal, end_of_line = self._take_line(chunk)
+			yield from self.feed(signal)
+
+			if end_of_line:
+				break
+
+	async def aiter_markers(
+		self, reader: asyncio.StreamReader, chunk_size: int = _CHUNK_SIZE
+	) -> AsyncIterator[Tuple[int, int]]:
+		"""
+		Reads an asyncio stream chunk by chunk and yields each marker as soon as it is found.
+		Reading stops once every marker has been found or once the line holding the datastream
+		ends.
+
+		:param asyncio.StreamReader reader: Stream to be read
+		:param int chunk_size: Maximum number of bytes read at a time, defaults to _CHUNK_SIZE
+		:return AsyncIterator[Tuple[int, int]]: Iterator over the (window size, marker) found
+		"""
+		while not self.done:
+			chunk = await reader.read(chunk_size)
+			if not chunk:
+				break
+
+			signal, end_of_line = self._take_line(chunk)
+			for found in self.feed(signal):
+				yield found
+
+			if end_of_line:
+				break
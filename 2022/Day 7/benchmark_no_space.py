@@ -0,0 +1,213 @@
+"""
+This script will benchmark the directory structure representations of the no space left on
+device challenge against one another on a randomly generated transcript. Parse throughput and
+memory used per item (directory or file) are reported for each representation.
+
+Example:
+	python benchmark_no_space.py --num-directories 100000 --files-per-directory 10
+
+Author: Ryan Lanciloti
+Date of Creation: 10/17/26
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from typing import Dict, List, Tuple
+
+from no_space import (
+	_ENGINES, _THRESHOLD_SIZE, _TOTAL_SPACE_AVAILABLE, _UPDATE_SIZE, _build_file_system
+)
+
+
+def _generate_transcript(args: argparse.Namespace) -> List[str]:
+	"""
+	This function will generate the transcript of a random directory structure, visiting every
+	directory once in depth first order
+
+	:param argparse.Namespace args: Namespace with the benchmark parameters
+	:return List[str]: Lines of the transcript
+	"""
+	rng = random.Random(args.seed)
+	children: List[List[int]] = [list() for _ in range(args.num_directories + 1)]
+
+	for directory in range(1, args.num_directories + 1):
+		children[rng.randrange(directory)].append(directory)
+
+	def list_directory(directory: int):
+		"""
+		Helper function which appends the listing of a directory to the transcript
+
+		:param int directory: Index of the directory
+		"""
+		lines.append("$ ls")
+		lines.extend(f"dir d{position}" for position in range(len(children[directory])))
+		lines.extend(
+			f"{rng.randint(1, args.max_file_size)} f{position}.txt"
+			for position in range(args.files_per_directory)
+		)
+
+	lines = ["$ cd /"]
+	list_directory(0)
+	pending = [iter(enumerate(children[0]))]
+
+	while pending:
+		position, child = next(pending[-1], (None, None))
+
+		if child is None:
+			pending.pop()
+			if pending:
+				lines.append("$ cd ..")
+			continue
+
+		lines.append(f"$ cd d{position}")
+		list_directory(child)
+		pending.append(iter(enumerate(children[child])))
+
+	return lines
+
+
+def _run_benchmark(args: argparse.Namespace) -> Dict[str, Tuple[float, float, float]]:
+	"""
+	This function will time the parsing of the same transcript into every representation,
+	measure the memory each one holds on to and verify that they all agree on the answers
+
+	:param argparse.Namespace args: Namespace with the benchmark parameters
+	:return Dict[str, Tuple[float, float, float]]: (best parse time in seconds, parse throughput
+	in MB/s, bytes per item) of each engine
+	"""
+	lines = _generate_transcript(args)
+	num_items = args.num_directories + 1 + (args.num_directories + 1) * args.files_per_directory
+
+	results = dict()
+	answers = dict()
+
+	with tempfile.TemporaryDirectory() as tmp_dir:
+		namespace = argparse.Namespace(
+			infile=os.path.join(tmp_dir, "transcript.txt"), total_size=_TOTAL_SPACE_AVAILABLE,
+			update_size=_UPDATE_SIZE, size_threshold=_THRESHOLD_SIZE
+		)
+
+		with open(namespace.infile, "w") as fptr:
+			fptr.write("\n".join(lines) + "\n")
+
+		transcript_size = os.path.getsize(namespace.infile) / (1 << 20)
+		del lines
+
+		for engine in args.engines:
+			namespace.engine = engine
+			best = float("inf")
+
+			for _ in range(args.repeat):
+				start = time.perf_counter()
+				file_system = _build_file_system(namespace)
+				best = min(best, time.perf_counter() - start)
+				del file_system
+
+			tracemalloc.start()
+			file_system = _build_file_system(namespace)
+			memory, _ = tracemalloc.get_traced_memory()
+			tracemalloc.stop()
+
+			results[engine] = (best, transcript_size / best, memory / num_items)
+			answers[engine] = (
+				file_system.get_total_size_of_directories_below_threshold(),
+				file_system.find_smallest_directory_to_delete()
+			)
+			del file_system
+
+	if len(set(answers.values())) > 1:
+		raise RuntimeError(f"The engines do not agree on the answers: {answers}")
+
+	return results
+
+
+def _validate_arguments(args: argparse.Namespace):
+	"""
+	This function will validate the arguments provided and raise the proper errors
+
+	:param argparse.Namespace args: Namespace with the correct arguments
+	"""
+	for name in ("max_file_size", "repeat"):
+		if getattr(args, name) < 1:
+			raise ValueError(f"The value of '{name}' must be at least 1")
+
+	for name in ("num_directories", "files_per_directory"):
+		if getattr(args, name) < 0:
+			raise ValueError(f"The value of '{name}' can not be negative")
+
+
+def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
+	"""
+	Parses through the commandline arguments and returns the namespace with the
+	parsed values.
+
+	:return argparse.Namespace: Object containing the commandline arguments
+	"""
+	parser = argparse.ArgumentParser("No Space Left On Device Benchmark")
+
+	parser.add_argument(
+		"--num-directories", dest='num_directories', type=int, required=False, default=100000,
+		help="Number of directories below the top level directory"
+	)
+
+	parser.add_argument(
+		"--files-per-directory", dest='files_per_directory', type=int, required=False,
+		default=10,
+		help="Number of files in each directory"
+	)
+
+	parser.add_argument(
+		"--max-file-size", dest='max_file_size', type=int, required=False, default=100000,
+		help="Largest size of a file"
+	)
+
+	parser.add_argument(
+		"--engine", dest='engines', type=str, required=False, action="append",
+		choices=sorted(_ENGINES),
+		help="Engine to benchmark, can be provided multiple times (defaults to every engine)"
+	)
+
+	parser.add_argument(
+		"--repeat", dest='repeat', type=int, required=False, default=3,
+		help="Number of times each engine is run, the best time is reported"
+	)
+
+	parser.add_argument(
+		"--seed", dest='seed', type=int, required=False, default=0,
+		help="Seed used to generate the transcript"
+	)
+
+	args = parser.parse_args() if cmd_args is None else parser.parse_args(cmd_args)
+	args.engines = args.engines or sorted(_ENGINES)
+	_validate_arguments(args)
+
+	return args
+
+
+def main(cmd_args: list = None) -> Dict[str, Tuple[float, float, float]]:
+	"""
+	Main function which will act as an entry point for this script. Returns the best parse time
+	(in seconds), the parse throughput (in MB/s) and the memory used per item (in bytes) of
+	each benchmarked engine.
+
+	:param list cmd_args: Optional list of commandline arguments, defaults to None
+	:return Dict[str, Tuple[float, float, float]]: (parse time, throughput, bytes per item) of
+	each engine
+	"""
+	args = _get_arguments(cmd_args)
+
+	return _run_benchmark(args)
+
+
+if __name__ == '__main__':
+	engine_results = main()
+
+	for engine_name, (timing, throughput, bytes_per_item) in sorted(engine_results.items()):
+		print(
+			f"{engine_name:>10}: {timing * 1000:10.2f} ms ({throughput:7.2f} MB/s), "
+			f"{bytes_per_item:8.1f} bytes per item"
+		)
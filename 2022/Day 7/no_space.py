@@ -80,94 +80,86 @@ Date of Creation: 12/6/22
 import os
 import argparse
 
-from typing import Tuple, List, TextIO
+from typing import List, Optional, Tuple, Union
 
-from user_classes import Directory, File
-
-_TOP_LEVEL_DIRECTORY: Directory = Directory("/")
-_DIRECTORIES: List[Directory] = [_TOP_LEVEL_DIRECTORY]
+from user_classes import CompactFileSystem, FileSystem
 
 _TOTAL_SPACE_AVAILABLE = 70000000
 _UPDATE_SIZE = 30000000
 _THRESHOLD_SIZE = 100000
 
+_READ_SIZE = 1 << 20  # Approximate number of characters read from the input file at a time
+
+_ENGINES = {
+	"compact": CompactFileSystem,
+	"objects": FileSystem,
+}
 
-def _find_smallest_directory_to_delete() -> int:
+
+def _build_file_system(args: argparse.Namespace) -> Union[FileSystem, CompactFileSystem]:
 	"""
-	This function will find the smallest directory which, when deleted, will free up enough
-	space to apply the update.
+	This function will open the input file and build the correct directory structure as
+	described in the input file. The input file is read in blocks of lines and the current
+	working directory is tracked with an explicit stack, so the depth of the directory
+	structure is not limited by the recursion limit.
 
-	:return int: Size of the directory to be deleted
+	:param argparse.Namespace args: Namespace containing the commandline arguments
+	:return Union[FileSystem, CompactFileSystem]: File system described by the input file, with
+	the provided limits
 	"""
-	sorted_directories: List[Directory] = \
-		sorted(_DIRECTORIES, key=lambda x: x.size, reverse=True)
+	file_system = _ENGINES[args.engine](args.total_size, args.update_size, args.size_threshold)
 
-	available_space = _TOTAL_SPACE_AVAILABLE - _TOP_LEVEL_DIRECTORY.size
-	extra_space_needed = _UPDATE_SIZE - available_space
+	with open(args.infile, "r") as fptr:
+		for lines in iter(lambda: fptr.readlines(_READ_SIZE), []):
+			for line in lines:
+				cmd = line.split()
 
-	last_dir = _TOP_LEVEL_DIRECTORY
-	for _dir in sorted_directories:
-		if _dir.size >= extra_space_needed:
-			last_dir = _dir
-		else:
-			return last_dir.size
+				if not cmd:
+					continue
 
+				if cmd[0] == "$":
+					if cmd[1] == "cd":
+						file_system.change_directory(cmd[2])
+					elif cmd[1] == "ls":
+						file_system.list_directory()
 
-def _get_total_size_of_directories_below_threshold() -> int:
-	"""
-	This function will loop through all directories and return the total size of all directories
-	below a given threshold.
+				elif cmd[0] == "dir":
+					file_system.add_directory(cmd[1])
 
-	:return int: Total size of directories
-	"""
-	total_size = 0
-	for _dir in _DIRECTORIES:
-		if _dir.size <= _THRESHOLD_SIZE:
-			total_size += _dir.size
+				elif cmd[0].isnumeric():
+					file_system.add_file(cmd[1], int(cmd[0]))
 
-	return total_size
+	return file_system
 
 
-def _build_directory_structure(args: argparse.Namespace):
+def _read_queries(query_file: Optional[str]) -> List[List[int]]:
 	"""
-	This function will open the input file and build the correct directory structure as
-	described in the input file.
+	This function will read the sets of limits to analyze the input file with, one set of
+	three integers (total size, update size, size threshold) per non-empty line
 
-	:param argparse.Namespace args: Namespace containing the commandline arguments
+	:param Optional[str] query_file: Path to the query file, None if there is none
+	:return List[List[int]]: Sets of limits
 	"""
-	def execute_cmd(cwd: Directory, cmd_stream: TextIO):
-		"""
-		This function will execute the command as provided on the current line in the current
-		working directory.
+	if query_file is None:
+		return list()
 
-		:param Directory cwd: Current working directory
-		:param TextIO cmd_stream: Command to be parsed (or command output)
-		"""
-		cmd = cmd_stream.readline().split()
+	if not os.path.exists(query_file):
+		raise ValueError(f"The provided query file does not exist: {query_file}")
 
-		while cmd:
-			if cmd[0] == "$" and cmd[1] == "cd":
-				if cmd[2] == ".." and cwd != _TOP_LEVEL_DIRECTORY:
-					return
-				if cmd[2] == "/":
-					execute_cmd(_TOP_LEVEL_DIRECTORY, cmd_stream)
-				else:
-					execute_cmd(cwd.get(cmd[2]), cmd_stream)
+	queries = list()
 
-			elif cmd[0] == "dir":
-				_dir = Directory(cmd[1])
-				cwd.add(_dir)
-				_DIRECTORIES.append(_dir)
+	with open(query_file, "r") as fptr:
+		for line in fptr:
+			if not line.strip():
+				continue
 
-			elif cmd[0].isnumeric():
-				cwd.add(File(cmd[1], int(cmd[0])))
+			query = line.split()
+			if len(query) != 3 or not all(value.isnumeric() for value in query):
+				raise ValueError(f"Invalid query, expected three sizes: {line.strip()}")
 
-			cmd = cmd_stream.readline().split()
+			queries.append([int(value) for value in query])
 
-	cwd = _TOP_LEVEL_DIRECTORY
-
-	with open(args.infile, "r") as fptr:
-		execute_cmd(cwd, fptr)
+	return queries
 
 
 def _validate_arguments(args: argparse.Namespace):
@@ -179,20 +171,8 @@ def _validate_arguments(args: argparse.Namespace):
 	if not os.path.exists(args.infile):
 		raise ValueError(f"The provided file does not exist: {args.infile}")
 
-	if args.total_size and args.update_size:
-		if args.total_size < args.update_size:
-			raise ValueError(
-				"Space required for the update exceeded the total space available."
-			)
-
-	if args.total_size and not args.update_size:
-		if args.total_size < _UPDATE_SIZE:
-			raise ValueError(
-				"Space required for the update exceeded the total space available."
-			)
-
-	if not args.total_size and args.update_size:
-		if _TOTAL_SPACE_AVAILABLE < args.update_size:
+	for total_size, update_size, _ in [(args.total_size, args.update_size, 0)] + args.queries:
+		if total_size < update_size:
 			raise ValueError(
 				"Space required for the update exceeded the total space available."
 			)
@@ -205,9 +185,6 @@ def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 
 	:return argparse.Namespace: Object containing the commandline arguments
 	"""
-	# pylint: disable=global-statement
-	global _TOTAL_SPACE_AVAILABLE, _UPDATE_SIZE, _THRESHOLD_SIZE
-
 	parser = argparse.ArgumentParser("No Space Left On Device")
 
 	parser.add_argument(
@@ -217,66 +194,108 @@ def _get_arguments(cmd_args: list = None) -> argparse.Namespace:
 
 	parser.add_argument(
 		"--total-size", dest='total_size', type=int, required=False,
+		default=_TOTAL_SPACE_AVAILABLE,
 		help="Total space available on the device"
 	)
 
 	parser.add_argument(
 		"--update-size", dest='update_size', type=int, required=False,
+		default=_UPDATE_SIZE,
 		help="Size required for the update"
 	)
 
 	parser.add_argument(
 		"--size-threshold", dest='size_threshold', type=int, required=False,
+		default=_THRESHOLD_SIZE,
 		help="Size threshold for directories"
 	)
 
+	parser.add_argument(
+		"--query", dest='queries', type=int, nargs=3, required=False, action="append",
+		metavar=("TOTAL_SIZE", "UPDATE_SIZE", "SIZE_THRESHOLD"),
+		help="Set of limits to analyze the input file with, can be provided multiple times"
+	)
+
+	parser.add_argument(
+		"--query-file", dest='query_file', type=str, required=False,
+		help="Path to a file with one set of limits per line: TOTAL_SIZE UPDATE_SIZE SIZE_THRESHOLD"
+	)
+
+	parser.add_argument(
+		"--engine", dest='engine', type=str, required=False, default="objects",
+		choices=sorted(_ENGINES),
+		help="Representation of the directory structure, 'compact' uses flat arrays"
+	)
+
 	args = parser.parse_args() if cmd_args is None else parser.parse_args(cmd_args)
+	args.queries = (args.queries or list()) + _read_queries(args.query_file)
 	_validate_arguments(args)
 
-	_TOTAL_SPACE_AVAILABLE = _TOTAL_SPACE_AVAILABLE if not args.total_size else args.total_size
-	_UPDATE_SIZE = _UPDATE_SIZE if not args.update_size else args.update_size
-	_THRESHOLD_SIZE = _THRESHOLD_SIZE if not args.size_threshold else args.size_threshold
-
 	return args
 
 
-def main(cmd_args: list = None) -> Tuple[int, int]:
+def _analyze(args: argparse.Namespace) -> Union[Tuple[int, int], List[Tuple[int, int]]]:
+	"""
+	This function will build the file system described by the input file and answer the
+	challenges for the limits (or each set of limits) in the parsed commandline arguments
+
+	:param argparse.Namespace args: Namespace containing the commandline arguments
+	:return Union[Tuple[int, int], List[Tuple[int, int]]]: (A, B) or one (A, B) per query
+	"""
+	file_system = _build_file_system(args)
+
+	if args.queries:
+		return [
+			(
+				file_system.get_total_size_of_directories_below_threshold(size_threshold),
+				file_system.find_smallest_directory_to_delete(total_size, update_size)
+			)
+			for total_size, update_size, size_threshold in args.queries
+		]
+
+	return (
+		file_system.get_total_size_of_directories_below_threshold(),
+		file_system.find_smallest_directory_to_delete()
+	)
+
+
+def main(cmd_args: list = None) -> Union[Tuple[int, int], List[Tuple[int, int]]]:
 	"""
 	Main function which will act as an entry point for this script. Returns a tuple
 	containing two values: (A, B)
 
-	A = Total size of all directories that are, at most, of size _THRESHOLD_SIZE
+	A = Total size of all directories that are, at most, of the size threshold
 	B = Size of the directory which, when deleted, allows for the update to be applied
 
+	When queries are provided, a list holding one such tuple per set of limits is returned
+	instead. The directory sizes are indexed once, so each query is answered in O(log n).
+
 	Example provided in the file header
 
 	:param list cmd_args: Optional list of commandline arguments, defaults to None
 	:return tuple[int,int]: (A, B)
 	"""
-	global _TOP_LEVEL_DIRECTORY, _DIRECTORIES  # pylint: disable=global-statement
-
-	# START: Reinitializing globals - Probably should refactor so I'm not using globals
-	_TOP_LEVEL_DIRECTORY = Directory("/")
-	_DIRECTORIES = [_TOP_LEVEL_DIRECTORY]
-	# END: Reinitializing globals - Probably should refactor so I'm not using globals
-
-	args = _get_arguments(cmd_args)
-	_build_directory_structure(args)
-
-	return (
-		_get_total_size_of_directories_below_threshold(),
-		_find_smallest_directory_to_delete()
-	)
+	return _analyze(_get_arguments(cmd_args))
 
 
 if __name__ == '__main__':
-	retval1, retval2 = main()
-
-	print(
-		f"Total size of all directories which are, at most, of size {_THRESHOLD_SIZE}: "
-		f"{retval1}"
-	)
-	print(
-		f"Size of the directory which, when deleted, allows for the update to be applied: "
-		f"{retval2}"
-	)
+	arguments = _get_arguments()
+	results = _analyze(arguments)
+
+	if arguments.queries:
+		for (total, update, threshold), (retval1, retval2) in zip(arguments.queries, results):
+			print(
+				f"Total size {total}, update size {update}, size threshold {threshold}: "
+				f"{retval1} {retval2}"
+			)
+	else:
+		retval1, retval2 = results
+
+		print(
+			"Total size of all directories which are, at most, of size "
+			f"{arguments.size_threshold}: {retval1}"
+		)
+		print(
+			f"Size of the directory which, when deleted, allows for the update to be applied: "
+			f"{retval2}"
+		)
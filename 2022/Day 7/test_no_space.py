@@ -4,11 +4,15 @@ This file will contain the unit tests for the no_space challenge
 Author: Ryan Lanciloti
 Date of Creation: 12/6/22
 """
+import argparse
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 import pytest
-from no_space import main
+from no_space import main, _build_file_system, _ENGINES
+from user_classes import Directory, File, FileSystem
 
 _CUR_DIR_PATH = os.path.dirname(__file__)
 
@@ -46,15 +50,217 @@ def _build_test_suite() -> List[tuple]:
 	return list(zip(input_files, output_files))
 
 
+@pytest.mark.parametrize("engine", sorted(_ENGINES))
 @pytest.mark.parametrize("infile, outfile", _build_test_suite())
-def test_inputs(infile, outfile):
+def test_inputs(infile, outfile, engine):
 	"""
 	This function will verify that the expected input matches the expected output
 	"""
 	with open(outfile, "r") as fptr:
 		expected_output = fptr.read()
 
-	actual_output = main(['--infile', infile])
+	actual_output = main(['--infile', infile, '--engine', engine])
 
 	assert expected_output == str(actual_output), \
 		f"Expected: {expected_output} does not match actual: {str(actual_output)}"
+
+
+def test_directory_index():
+	"""
+	This function will verify that subdirectories are looked up by name and that an item listed
+	twice is only counted once
+	"""
+	root = Directory("/")
+	sub_dir = Directory("a")
+
+	assert root.add(sub_dir) is sub_dir
+	assert root.add(Directory("a")) is sub_dir
+	assert root.get("a") is sub_dir
+
+	sub_dir.add(File("b", 10))
+	root.add(File("b", 5))
+	root.add(File("b", 5))
+
+	assert root.size == 15, f"Expected: 15 does not match actual: {root.size}"
+
+	with pytest.raises(ValueError):
+		root.get("b")
+
+
+@pytest.mark.parametrize("engine", sorted(_ENGINES))
+def test_relisted_directory(tmp_path, engine):
+	"""
+	This function will verify that listing a directory a second time does not change the sizes
+	"""
+	infile = tmp_path / "input.txt"
+	infile.write_text(
+		"$ cd /\n$ ls\ndir a\n10 b\n$ cd a\n$ ls\ndir e\n20 c\n$ cd ..\n$ ls\ndir a\n10 b\n"
+	)
+
+	actual_output = main([
+		'--infile', str(infile), '--total-size', '60', '--update-size', '50', '--engine', engine
+	])
+
+	assert (50, 20) == actual_output, \
+		f"Expected: {(50, 20)} does not match actual: {actual_output}"
+
+
+def test_deep_directory_structure(tmp_path):
+	"""
+	This function will verify that directory structures deeper than the recursion limit are
+	parsed, and that 'cd /' returns to the top level directory from any depth
+	"""
+	depth = sys.getrecursionlimit() + 100
+	commands = [f"$ ls\ndir d{level}\n1 f\n$ cd d{level}\n" for level in range(depth)]
+	commands.append("$ cd /\n$ ls\n5 g\n")
+
+	infile = tmp_path / "input.txt"
+	infile.write_text("$ cd /\n" + "".join(commands))
+
+	file_system = _build_file_system(
+		argparse.Namespace(
+			infile=str(infile), total_size=100, update_size=10, size_threshold=10, engine="objects"
+		)
+	)
+	root = file_system.root
+
+	assert len(file_system.directories) == depth + 1
+	assert root.get("d0").get("d1").name == "d1"
+
+	files = [item.size for item in root._contents if isinstance(item, File)]
+	assert files == [1, 5], f"Expected: [1, 5] does not match actual: {files}"
+
+	actual_output = main(['--infile', str(infile), '--size-threshold', '10'])
+
+	assert actual_output[0] == 55, f"Expected: 55 does not match actual: {actual_output[0]}"
+
+	infile.write_text("$ cd /\n$ cd ..\n")
+
+	with pytest.raises(ValueError):
+		main(['--infile', str(infile)])
+
+
+def test_concurrent_analyses():
+	"""
+	This function will verify that several transcripts can be analyzed concurrently with
+	different limits without affecting one another
+	"""
+	cmd_args = [
+		['--infile', infile, '--total-size', str(total_size), '--size-threshold', str(threshold)]
+		for infile, _ in _build_test_suite()
+		for total_size in (50000000, 70000000)
+		for threshold in (1000, 100000)
+	] * 4
+
+	expected_output = [main(args) for args in cmd_args]
+
+	with ThreadPoolExecutor(max_workers=8) as executor:
+		actual_output = list(executor.map(main, cmd_args))
+
+	assert expected_output == actual_output, \
+		f"Expected: {expected_output} does not match actual: {actual_output}"
+
+
+def test_cached_results():
+	"""
+	This function will verify that results are cached per file system and refreshed once the
+	file system changes
+	"""
+	file_system = FileSystem(100, 50, 10)
+	file_system.add(File("a", 50))
+
+	assert file_system.find_smallest_directory_to_delete() == 50
+	assert file_system.get_total_size_of_directories_below_threshold(50) == 50
+
+	file_system.add(Directory("b"))
+	file_system.change_directory("b")
+	file_system.add(File("c", 5))
+	file_system.change_directory("/")
+	file_system.add(File("d", 1))
+
+	assert file_system.find_smallest_directory_to_delete() == 56
+	assert file_system.get_total_size_of_directories_below_threshold() == 5
+
+	sub_dir = file_system.root.get("b")
+	sub_dir.add(Directory("e"))
+	sub_dir.get("e").add(File("f", 7))
+
+	assert (file_system.root.size, sub_dir.size) == (63, 12), \
+		f"Expected: (63, 12) does not match actual: {(file_system.root.size, sub_dir.size)}"
+
+	actual_output = (
+		file_system.get_total_size_of_directories_below_threshold(100),
+		file_system.find_smallest_directory_to_delete(100, 44),
+		[_dir.name for _dir in file_system.directories]
+	)
+	expected_output = (63 + 12 + 7, 7, ["/", "b", "e"])
+
+	assert expected_output == actual_output, \
+		f"Expected: {expected_output} does not match actual: {actual_output}"
+
+	sub_dir.get("e").add(File("g", 1))
+	assert file_system.root.size == 64
+
+	actual_output = file_system.get_total_size_of_directories_below_threshold(100)
+
+	assert actual_output == 64 + 13 + 8, \
+		f"Expected: {64 + 13 + 8} does not match actual: {actual_output}"
+
+
+def test_batch_queries(tmp_path):
+	"""
+	This function will verify that many sets of limits are answered from one run and agree with
+	separate runs
+	"""
+	infile, _ = _build_test_suite()[0]
+	queries = [(70000000, 30000000, 100000), (50000000, 30000000, 0), (48381165, 0, 48381165)]
+
+	query_file = tmp_path / "queries.txt"
+	query_file.write_text("\n".join(" ".join(map(str, query)) for query in queries[1:]) + "\n")
+
+	expected_output = [
+		main([
+			'--infile', infile, '--total-size', str(total_size), '--update-size', str(update_size),
+			'--size-threshold', str(threshold)
+		])
+		for total_size, update_size, threshold in queries
+	]
+
+	actual_output = main([
+		'--infile', infile, '--query', *map(str, queries[0]), '--query-file', str(query_file)
+	])
+
+	assert actual_output == [(95437, 24933642), (0, 48381165), (73410244, 584)]
+	assert expected_output == actual_output, \
+		f"Expected: {expected_output} does not match actual: {actual_output}"
+
+
+def test_compact_file_system(tmp_path):
+	"""
+	This function will verify that the compact file system is built from the transcript as an
+	array per attribute
+	"""
+	infile, _ = _build_test_suite()[0]
+
+	file_system = _build_file_system(argparse.Namespace(
+		infile=infile, total_size=70000000, update_size=30000000, size_threshold=100000,
+		engine="compact"
+	))
+
+	actual_output = [
+		(file_system.get_name(directory), file_system.get_parent(directory),
+			file_system.get_size(directory))
+		for directory in range(len(file_system))
+	]
+	expected_output = [("/", -1, 48381165), ("a", 0, 94853), ("d", 0, 24933642), ("e", 1, 584)]
+
+	assert expected_output == actual_output, \
+		f"Expected: {expected_output} does not match actual: {actual_output}"
+
+	depth = sys.getrecursionlimit() + 100
+	infile = tmp_path / "input.txt"
+	infile.write_text("".join("$ ls\ndir d\n1 f\n$ cd d\n" for _ in range(depth)))
+
+	actual_output = main(['--infile', str(infile), '--size-threshold', '3', '--engine', 'compact'])
+
+	assert actual_output[0] == 6, f"Expected: 6 does not match actual: {actual_output[0]}"
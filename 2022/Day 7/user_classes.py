@@ -2,7 +2,15 @@
 This file will contain the classes used in teh no_space.py script
 """
 from __future__ import annotations
-from typing import Union
+
+import abc
+import bisect
+import itertools
+import threading
+
+from array import array
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 
@@ -11,21 +19,25 @@ class File:
 	"""
 	File: Represents a file
 	"""
-	def __init__(self, name: str, size: int):
-		"""
-		Constructor for the File class
+	__slots__ = ("name", "size")
 
-		:param str name: Name of the file
-		:param int size: Size of the file
-		"""
-		self.name: str = name
-		self.size: int = size
+	name: str  # Name of the file
+	size: int  # Size of the file
 
 
 class Directory:
 	"""
-	Directory: Represents a directory
+	Directory: Represents a directory. Its contents are kept in the order they were added and
+	are also indexed by name, so a subdirectory can be looked up in O(1).
+
+	The size of every directory is cached. Adding an item marks the directory and all of its
+	ancestors as outdated (stopping at the first ancestor which already is), and the next size
+	query recomputes the outdated directories below it in a single post-order pass.
 	"""
+	__slots__ = (
+		"name", "parent", "_contents", "_directories", "_files", "_file_size", "_size",
+		"_updated", "_version"
+	)
 
 	def __init__(self, name: str):
 		"""
@@ -33,9 +45,14 @@ class Directory:
 		:param str name: Name of the directory
 		"""
 		self.name: str = name
-		self._contents: list = []
+		self.parent: Optional[Directory] = None
+		self._contents: List[Union[Directory, File]] = []
+		self._directories: Dict[str, Directory] = dict()
+		self._files: Dict[str, File] = dict()
+		self._file_size: int = 0  # Total size of the files directly in this directory
 		self._size: int = 0
 		self._updated: bool = False
+		self._version: int = 0  # Number of times the directory became outdated
 
 	@property
 	def size(self) -> int:
@@ -44,17 +61,73 @@ class Directory:
 
 		:return int: Size of the directory
 		"""
-		if not self._updated:
-			return self._size
+		if self._updated:
+			self.update_sizes()
+
+		return self._size
+
+	def update_sizes(self):
+		"""
+		Recomputes the size of every outdated directory below (and including) this directory in
+		a single iterative post-order pass, so each directory is summed once and the depth of
+		the directory structure is not limited by the recursion limit
+		"""
+		pending: List[Tuple[Directory, bool]] = [(self, False)]
 
-		size = 0
+		while pending:
+			directory, children_done = pending.pop()
+
+			if not directory._updated:
+				continue
+
+			if children_done:
+				directory._size = directory._file_size + sum(
+					sub_dir._size for sub_dir in directory._directories.values()
+				)
+				directory._updated = False
+			else:
+				pending.append((directory, True))
+				pending.extend(
+					(sub_dir, False) for sub_dir in directory._directories.values()
+					if sub_dir._updated
+				)
+
+	def _invalidate(self):
+		"""
+		Marks this directory and its ancestors as outdated. An outdated directory only has
+		outdated ancestors, so the walk stops at the first one found.
+		"""
+		directory = self
+
+		while directory is not None and not directory._updated:
+			directory._updated = True
+			directory._version += 1
+			directory = directory.parent
+
+	@property
+	def version(self) -> int:
+		"""
+		Returns a number which changes whenever an item is added anywhere below this directory.
+		Outdated directories only have outdated ancestors, so any change below this directory
+		since it was last up to date makes it outdated again.
+
+		:return int: Version of the contents of the directory
+		"""
+		return self._version
+
+	def iter_directories(self) -> Iterator[Directory]:
+		"""
+		Iterates over this directory and every directory below it, parents before their
+		subdirectories, without recursing
 
-		for item in self._contents:
-			size += item.size
+		:return Iterator[Directory]: Iterator over the directories
+		"""
+		pending = [self]
 
-		self._size = size
-		self._updated = False
-		return size
+		while pending:
+			directory = pending.pop()
+			yield directory
+			pending.extend(reversed(directory._directories.values()))
 
 	def get(self, dir_name: str) -> Directory:
 		"""
@@ -63,21 +136,461 @@ class Directory:
 		:param str dir_name: Name of the directory to return
 		:return Directory: Reference to the directory with a given name
 		"""
-		for item in self._contents:
-			if isinstance(item, Directory) and item.name == dir_name:
-				return item
-
-		raise ValueError(
-			"No directory of the given name found in the current directory.\n"
-			f"Current Directory: {self.name}"
-			f"Requested Directory: {dir_name}"
-		)
+		try:
+			return self._directories[dir_name]
+		except KeyError:
+			raise ValueError(
+				"No directory of the given name found in the current directory.\n"
+				f"Current Directory: {self.name}"
+				f"Requested Directory: {dir_name}"
+			) from None
 
-	def add(self, item: Union[Directory, File]):
+	def add(self, item: Union[Directory, File]) -> Union[Directory, File]:
 		"""
-		This function adds a given item to the contents list
+		This function adds a given item to the contents list. An item which was already added
+		(e.g. when a directory is listed twice) is kept as is, so it is not counted twice.
 
 		:param Union[Directory, File] item: Item to be added to the contents list
+		:return Union[Directory, File]: Item held by the directory under the name of the item
 		"""
+		index = self._directories if isinstance(item, Directory) else self._files
+
+		if item.name in index:
+			return index[item.name]
+
+		index[item.name] = item
 		self._contents.append(item)
-		self._updated = True
+
+		if isinstance(item, Directory):
+			item.parent = self
+		else:
+			self._file_size += item.size
+
+		self._invalidate()
+
+		return item
+
+
+class DirectorySizeIndex:
+	"""
+	DirectorySizeIndex: Sorted sizes of every directory along with their prefix sums, built once
+	so that capacity queries are answered in O(log n) with a binary search
+	"""
+	__slots__ = ("_sizes", "_prefix_sums")
+
+	def __init__(self, sizes: Iterable[int]):
+		"""
+		Constructor for the DirectorySizeIndex class
+
+		:param Iterable[int] sizes: Size of every directory
+		"""
+		self._sizes: array = array("q", sorted(sizes))
+		self._prefix_sums: array = array("q", itertools.accumulate(self._sizes, initial=0))
+
+	def __len__(self) -> int:
+		return len(self._sizes)
+
+	def total_size_at_most(self, size_threshold: int) -> int:
+		"""
+		Returns the total size of all directories which are, at most, of a given size
+
+		:param int size_threshold: Size threshold
+		:return int: Total size of the directories
+		"""
+		return self._prefix_sums[bisect.bisect_right(self._sizes, size_threshold)]
+
+	def smallest_size_at_least(self, size: int) -> int:
+		"""
+		Returns the size of the smallest directory which is, at least, of a given size
+
+		:param int size: Minimum size of the directory
+		:return int: Size of the directory
+		"""
+		position = bisect.bisect_left(self._sizes, size)
+
+		if position == len(self._sizes):
+			raise ValueError(f"No directory is of size {size} or more. Please verify inputs.")
+
+		return self._sizes[position]
+
+
+class _FileSystemBase(abc.ABC):
+	"""
+	_FileSystemBase: Limits, lock and size index shared by the file system representations.
+	Each instance owns its own directory structure and size index, so several file systems can
+	be built and analyzed concurrently (e.g. in a thread pool). The size index is built by the
+	first query after the file system changes and is shared by every later query, which may
+	override the limits. Queries on a single instance are serialized by a lock.
+	"""
+
+	def __init__(self, total_space: int, update_size: int, size_threshold: int):
+		"""
+		Constructor for the _FileSystemBase class
+
+		:param int total_space: Total space available on the device
+		:param int update_size: Size required for the update
+		:param int size_threshold: Size threshold for directories
+		"""
+		if total_space < update_size:
+			raise ValueError("Space required for the update exceeded the total space available.")
+
+		self.total_space: int = total_space
+		self.update_size: int = update_size
+		self.size_threshold: int = size_threshold
+
+		self._size_index: Optional[DirectorySizeIndex] = None
+		self._lock: threading.RLock = threading.RLock()
+
+	@property
+	@abc.abstractmethod
+	def used_space(self) -> int:
+		"""
+		Returns the total size of the top level directory
+
+		:return int: Space used on the device
+		"""
+
+	@abc.abstractmethod
+	def _get_directory_sizes(self) -> Iterable[int]:
+		"""
+		Returns the up to date size of every directory
+
+		:return Iterable[int]: Size of every directory
+		"""
+
+	@abc.abstractmethod
+	def add_directory(self, name: str):
+		"""
+		Adds a directory to the current working directory
+
+		:param str name: Name of the directory
+		"""
+
+	@abc.abstractmethod
+	def add_file(self, name: str, size: int):
+		"""
+		Adds a file to the current working directory
+
+		:param str name: Name of the file
+		:param int size: Size of the file
+		"""
+
+	@abc.abstractmethod
+	def change_directory(self, dir_name: str):
+		"""
+		Executes a 'cd' command in constant time
+
+		:param str dir_name: Argument of the 'cd' command ('/', '..' or a subdirectory name)
+		"""
+
+	def list_directory(self):
+		"""
+		Executes an 'ls' command, the items added up until the next command are the contents of
+		the current working directory
+		"""
+
+	@property
+	def size_index(self) -> DirectorySizeIndex:
+		"""
+		Returns the index over the size of every directory, building it if the file system
+		changed since it was last built
+
+		:return DirectorySizeIndex: Index over the directory sizes
+		"""
+		with self._lock:
+			if self._is_size_index_outdated():
+				self._size_index = DirectorySizeIndex(self._get_directory_sizes())
+
+			return self._size_index
+
+	def _is_size_index_outdated(self) -> bool:
+		"""
+		Returns whether the size index needs to be built again before it is queried
+
+		:return bool: True if the size index is missing or outdated
+		"""
+		return self._size_index is None
+
+	def get_total_size_of_directories_below_threshold(self, size_threshold: int = None) -> int:
+		"""
+		Returns the total size of all directories which are, at most, of a given size
+
+		:param int size_threshold: Size threshold, defaults to the one of the file system
+		:return int: Total size of directories
+		"""
+		size_threshold = self.size_threshold if size_threshold is None else size_threshold
+
+		return self.size_index.total_size_at_most(size_threshold)
+
+	def find_smallest_directory_to_delete(
+		self, total_space: int = None, update_size: int = None
+	) -> int:
+		"""
+		Returns the size of the smallest directory which, when deleted, will free up enough space
+		to apply the update
+
+		:param int total_space: Total space available, defaults to the one of the file system
+		:param int update_size: Size of the update, defaults to the one of the file system
+		:return int: Size of the directory to be deleted
+		"""
+		total_space = self.total_space if total_space is None else total_space
+		update_size = self.update_size if update_size is None else update_size
+
+		with self._lock:
+			size_index = self.size_index
+			extra_space_needed = update_size - (total_space - self.used_space)
+
+		return size_index.smallest_size_at_least(extra_space_needed)
+
+
+class FileSystem(_FileSystemBase):
+	"""
+	FileSystem: Represents the directory structure described by one transcript as a tree of
+	Directory and File objects, along with the limits it is analyzed with. The tree can also
+	be changed directly through the directories below root, the size index is then rebuilt by
+	the next query.
+	"""
+
+	def __init__(self, total_space: int, update_size: int, size_threshold: int):
+		"""
+		Constructor for the FileSystem class
+
+		:param int total_space: Total space available on the device
+		:param int update_size: Size required for the update
+		:param int size_threshold: Size threshold for directories
+		"""
+		super().__init__(total_space, update_size, size_threshold)
+
+		self.root: Directory = Directory("/")
+
+		self._indexed_version: int = -1  # Version of root when the size index was built
+		self._path: List[Directory] = [self.root]  # Top level directory down to the cwd
+
+	@property
+	def cwd(self) -> Directory:
+		"""
+		Returns the current working directory
+
+		:return Directory: Current working directory
+		"""
+		return self._path[-1]
+
+	@property
+	def directories(self) -> List[Directory]:
+		"""
+		Returns every directory of the file system, starting with the top level directory
+
+		:return List[Directory]: Every directory
+		"""
+		return list(self.root.iter_directories())
+
+	@property
+	def used_space(self) -> int:
+		return self.root.size
+
+	def _get_directory_sizes(self) -> Iterable[int]:
+		self.root.update_sizes()
+		self._indexed_version = self.root.version
+
+		return (_dir.size for _dir in self.root.iter_directories())
+
+	def _is_size_index_outdated(self) -> bool:
+		return super()._is_size_index_outdated() or self._indexed_version != self.root.version
+
+	def change_directory(self, dir_name: str):
+		"""
+		Executes a 'cd' command in constant time
+
+		:param str dir_name: Argument of the 'cd' command ('/', '..' or a subdirectory name)
+		"""
+		if dir_name == "/":
+			del self._path[1:]
+		elif dir_name != "..":
+			self._path.append(self.cwd.get(dir_name))
+		elif len(self._path) > 1:
+			self._path.pop()
+		else:
+			raise ValueError("Cannot move out of the top level directory. Please verify inputs.")
+
+	def add(self, item: Union[Directory, File]):
+		"""
+		Adds a directory or a file to the current working directory
+
+		:param Union[Directory, File] item: Item to be added
+		"""
+		with self._lock:
+			self.cwd.add(item)
+
+	def add_directory(self, name: str):
+		self.add(Directory(name))
+
+	def add_file(self, name: str, size: int):
+		self.add(File(name, size))
+
+
+class CompactFileSystem(_FileSystemBase):
+	"""
+	CompactFileSystem: Represents the directory structure described by one transcript as a
+	struct of arrays instead of one object per item. Directory i is described by the i-th entry
+	of each array: the index of its parent, the index of its name in a table of interned names
+	and the total size of the files directly in it. Files are only accounted for in the size of
+	their directory, so they take up no memory of their own.
+
+	A directory is always added after its parent, so walking the directories backwards and
+	adding each size to the one of its parent computes every directory size in one O(n) pass.
+	Since files are not kept, a directory listed a second time has its listing skipped.
+	"""
+
+	def __init__(self, total_space: int, update_size: int, size_threshold: int):
+		"""
+		Constructor for the CompactFileSystem class
+
+		:param int total_space: Total space available on the device
+		:param int update_size: Size required for the update
+		:param int size_threshold: Size threshold for directories
+		"""
+		super().__init__(total_space, update_size, size_threshold)
+
+		self._name_table: List[str] = ["/"]
+		self._name_ids: Dict[str, int] = {"/": 0}
+
+		self._parents: array = array("l", [-1])
+		self._names: array = array("l", [0])
+		self._file_sizes: array = array("q", [0])
+		self._listed: bytearray = bytearray(1)
+		self._children: Dict[int, int] = dict()  # (parent << 32 | name id) -> directory
+
+		self._sizes: Optional[array] = None
+		self._path: array = array("l", [0])  # Top level directory down to the cwd
+		self._skip_listing: bool = False
+
+	def __len__(self) -> int:
+		return len(self._parents)
+
+	def _intern(self, name: str) -> int:
+		"""
+		Returns the index of a name in the name table, adding it if it is not there yet
+
+		:param str name: Name of a directory
+		:return int: Index of the name in the name table
+		"""
+		name_id = self._name_ids.get(name)
+
+		if name_id is None:
+			name_id = self._name_ids[name] = len(self._name_table)
+			self._name_table.append(name)
+
+		return name_id
+
+	def get_name(self, directory: int) -> str:
+		"""
+		Returns the name of a directory
+
+		:param int directory: Index of the directory
+		:return str: Name of the directory
+		"""
+		return self._name_table[self._names[directory]]
+
+	def get_parent(self, directory: int) -> int:
+		"""
+		Returns the parent of a directory
+
+		:param int directory: Index of the directory
+		:return int: Index of the parent directory (-1 for the top level directory)
+		"""
+		return self._parents[directory]
+
+	def get_size(self, directory: int) -> int:
+		"""
+		Returns the total size of a directory
+
+		:param int directory: Index of the directory
+		:return int: Size of the directory
+		"""
+		with self._lock:
+			return self._update_sizes()[directory]
+
+	def _update_sizes(self) -> array:
+		"""
+		Computes the size of every directory if the file system changed since they were last
+		computed
+
+		:return array: Size of every directory
+		"""
+		if self._sizes is None:
+			sizes = array("q", self._file_sizes)
+			parents = self._parents
+
+			for directory in range(len(sizes) - 1, 0, -1):
+				sizes[parents[directory]] += sizes[directory]
+
+			self._sizes = sizes
+
+		return self._sizes
+
+	@property
+	def used_space(self) -> int:
+		return self.get_size(0)
+
+	def _get_directory_sizes(self) -> Iterable[int]:
+		return self._update_sizes()
+
+	def change_directory(self, dir_name: str):
+		"""
+		Executes a 'cd' command in constant time
+
+		:param str dir_name: Argument of the 'cd' command ('/', '..' or a subdirectory name)
+		"""
+		self._skip_listing = False
+
+		if dir_name == "/":
+			del self._path[1:]
+		elif dir_name != "..":
+			name_id = self._name_ids.get(dir_name, -1)
+			directory = self._children.get(self._path[-1] << 32 | name_id)
+
+			if directory is None:
+				raise ValueError(
+					"No directory of the given name found in the current directory.\n"
+					f"Current Directory: {self.get_name(self._path[-1])}"
+					f"Requested Directory: {dir_name}"
+				)
+
+			self._path.append(directory)
+		elif len(self._path) > 1:
+			self._path.pop()
+		else:
+			raise ValueError("Cannot move out of the top level directory. Please verify inputs.")
+
+	def list_directory(self):
+		cwd = self._path[-1]
+
+		self._skip_listing = bool(self._listed[cwd])
+		self._listed[cwd] = 1
+
+	def add_directory(self, name: str):
+		if self._skip_listing:
+			return
+
+		with self._lock:
+			key = self._path[-1] << 32 | self._intern(name)
+
+			if key not in self._children:
+				self._children[key] = len(self._parents)
+				self._parents.append(self._path[-1])
+				self._names.append(key & 0xFFFFFFFF)
+				self._file_sizes.append(0)
+				self._listed.append(0)
+
+				self._sizes = None
+				self._size_index = None
+
+	def add_file(self, name: str, size: int):
+		if self._skip_listing:
+			return
+
+		with self._lock:
+			self._file_sizes[self._path[-1]] += size
+
+			self._sizes = None
+			self._size_index = None